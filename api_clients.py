@@ -5,51 +5,238 @@ Phase 2: Google Maps Geocoding, Smarty US Street Address
 Phase 4: Postmark transactional email
 """
 
+import abc
+import atexit
 import logging
-import requests
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from threading import RLock
+
+import httpx
+import orjson
+from cachetools import TLRUCache, TTLCache
 
 import config
 
 logger = logging.getLogger(__name__)
 
+# One pooled HTTP/2 client for every vendor — keep-alive reuses the TCP+TLS
+# connection across calls, and concurrent requests to the same host share
+# it as multiplexed streams instead of opening more sockets.
+# Compressed JSON responses: httpx advertises gzip/deflate always and br
+# when the brotli package is installed (it is, via requirements.txt).
+_DEFAULT_HEADERS = {"Accept": "application/json"}
+
+_HTTPX = httpx.Client(
+    headers=_DEFAULT_HEADERS,
+    timeout=10.0,
+    transport=httpx.HTTPTransport(
+        http2=True,
+        retries=2,
+        limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+    ),
+)
+
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def _get(url, **kwargs):
+    """GET through the pooled client, retrying transient statuses twice.
+
+    Only GETs retry — a Postmark POST is never sent twice.
+    """
+    for attempt in range(3):
+        resp = _HTTPX.get(url, **kwargs)
+        if resp.status_code not in _RETRY_STATUSES or attempt == 2:
+            return resp
+        time.sleep(0.2 * 2 ** attempt)
+
+
+# Worker threads for the submit_* helpers. The calls are socket-bound, so
+# threads release the GIL and share _HTTPX's pooled connections.
+_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="enrich")
+# Cap in-flight Trestle requests to stay inside the provider's rate limit
+_TRESTLE_SLOTS = threading.Semaphore(4)
+
+# Geocode and Smarty answers are a pure function of the address, so repeat
+# lookups are served from memory. Failures go to the negative cache below.
+_CACHE_LOCK = RLock()
+_GEO_CACHE = TTLCache(maxsize=5000, ttl=7 * 86400)
+_SMARTY_CACHE = TTLCache(maxsize=5000, ttl=30 * 86400)
+_TRESTLE_CACHE = TTLCache(maxsize=10000, ttl=config.TTL_LINE_TYPE_DAYS * 86400)
+
+# Negative cache — known-bad lookups short-circuit instead of paying another
+# timeout. Entries are (ttl, value) keyed by (function, key); each failure
+# kind gets its own lifetime.
+_NEG_TTL_ERROR = 60              # network / HTTP error — likely transient
+_NEG_TTL_EMPTY = 300             # API answered, but with no match
+_NEG_TTL_SMARTY_N = 86400        # USPS says not deliverable
+_NEG_MISS = object()
+_NEG_CACHE = TLRUCache(maxsize=5000, ttu=lambda _key, entry, now: now + entry[0])
+
+
+def _neg_get(name, key):
+    """Return the cached failure value for (name, key), or _NEG_MISS."""
+    with _CACHE_LOCK:
+        entry = _NEG_CACHE.get((name, key))
+    return _NEG_MISS if entry is None else entry[1]
+
+
+def _neg_put(name, key, ttl, value=None):
+    with _CACHE_LOCK:
+        _NEG_CACHE[(name, key)] = (ttl, value)
+
+
+# ── Micro-batching ──────────────────────────────────────────────────
+
+class _Batcher(abc.ABC):
+    """Coalesce concurrent requests to a vendor's batch endpoint.
+
+    A background thread takes the first queued item, then keeps
+    collecting for up to max_wait_ms (or max_batch items) before handing
+    them to _send together. Each caller gets its own Future back.
+    """
+
+    name = "batcher"
+
+    def __init__(self, max_batch=100, max_wait_ms=50):
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._pending = set()
+
+    def submit(self, item):
+        """Queue one item. Returns a Future for its result."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+        future = Future()
+        with self._lock:
+            self._pending.add(future)
+        future.add_done_callback(self._done)
+        self._queue.put((item, future))
+        return future
+
+    def _done(self, future):
+        with self._lock:
+            self._pending.discard(future)
+
+    def drain(self, timeout=5):
+        """Wait for queued items to finish."""
+        with self._lock:
+            pending = list(self._pending)
+        if pending:
+            wait(pending, timeout=timeout)
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                self._send(batch)
+            except Exception as e:
+                logger.exception("%s failed", self.name)
+                for _, future in batch:
+                    if not future.done():
+                        self._fail(future, e)
+
+    @abc.abstractmethod
+    def _send(self, batch):
+        """Send one batch of (item, future) pairs and resolve every future."""
+
+    def _fail(self, future, error):
+        future.set_exception(error)
+
 
 # ── Trestle Reverse Phone API ───────────────────────────────────────
 
+_ADDR_KEYS = ("street_line_1", "street_line_2", "city", "state_code", "postal_code")
+
+
+# Values the vendors already send in lowercase; skip the .lower() copy.
+_ALREADY_LOWER = frozenset({
+    "", "mobile", "landline", "fixed voip", "non-fixed voip", "tollfree",
+    "valid", "invalid", "catch-all", "unknown", "spamtrap", "abuse", "do_not_mail",
+})
+
+
+def _lower(s):
+    return s if s in _ALREADY_LOWER else s.lower()
+
+
 def _format_address(addr):
     """Format a Trestle address dict into a readable string."""
-    if not isinstance(addr, dict):
-        return str(addr) if addr else None
-    parts = [
-        addr.get("street_line_1", ""),
-        addr.get("street_line_2", ""),
-        addr.get("city", ""),
-        addr.get("state_code", ""),
-        addr.get("postal_code", ""),
+    if not addr:
+        return None
+    if type(addr) is not dict:
+        return str(addr)
+    return ", ".join(v for k in _ADDR_KEYS if (v := addr.get(k))) or None
+
+
+def _parse_alternate_phones(phones):
+    """Normalize Trestle alternate_phones into [{"number", "type"}].
+
+    Trestle uses either camelCase or snake_case keys. The style of the first
+    entry is tried first, so a uniform list costs one lookup per field.
+    """
+    phones = [p for p in phones or () if isinstance(p, dict)]
+    if not phones:
+        return []
+    if "phoneNumber" in phones[0]:
+        num_key, num_alt = "phoneNumber", "phone_number"
+    else:
+        num_key, num_alt = "phone_number", "phoneNumber"
+    if "lineType" in phones[0]:
+        type_key, type_alt = "lineType", "line_type"
+    else:
+        type_key, type_alt = "line_type", "lineType"
+    return [
+        {"number": p.get(num_key) or p.get(num_alt),
+         "type": _lower(p.get(type_key) or p.get(type_alt) or "")}
+        for p in phones
     ]
-    return ", ".join(p for p in parts if p) or None
 
 
 def _parse_emails(emails):
     """Extract email strings from Trestle emails field (string or list)."""
-    if isinstance(emails, str) and emails:
+    if not emails:
+        return []
+    if type(emails) is str:
         return [emails]
-    if isinstance(emails, list):
-        result = []
-        for e in emails:
-            if isinstance(e, dict):
-                addr = e.get("email_address") or e.get("address")
-                if addr:
-                    result.append(addr)
-            elif isinstance(e, str) and e:
-                result.append(e)
-        return result
-    return []
+    if type(emails) is not list:
+        return []
+    result = []
+    append = result.append
+    for e in emails:
+        t = type(e)
+        if t is dict:
+            addr = e.get("email_address") or e.get("address")
+            if addr:
+                append(addr)
+        elif t is str and e:
+            append(e)
+    return result
 
 
-def trestle_reverse_phone(phone):
+def trestle_reverse_phone(phone, keep_raw=False):
     """Lookup a phone number via Trestle Reverse Phone API.
 
     Returns a rich dict with all available caller intelligence.
+    raw_response carries the full payload only when keep_raw=True —
+    otherwise it is None so cached results stay small.
     Returns None on failure.
     """
     if not config.TRESTLE_API_KEY:
@@ -57,131 +244,199 @@ def trestle_reverse_phone(phone):
         return None
 
     # Strip leading + from E.164 format — Trestle expects digits only
-    clean_phone = phone.lstrip("+")
+    clean_phone = phone[1:] if phone.startswith("+") else phone
+
+    with _CACHE_LOCK:
+        cached = _TRESTLE_CACHE.get(clean_phone)
+    if cached is not None and (not keep_raw or cached["raw_response"] is not None):
+        return dict(cached)
+    if _neg_get("trestle", clean_phone) is not _NEG_MISS:
+        return None
 
     url = f"{config.TRESTLE_BASE_URL}/phone"
     params = {"phone": clean_phone}
     headers = {"x-api-key": config.TRESTLE_API_KEY}
 
     try:
-        resp = requests.get(url, params=params, headers=headers, timeout=10)
+        with _TRESTLE_SLOTS:
+            resp = _get(url, params=params, headers=headers)
         resp.raise_for_status()
-        data = resp.json()
-    except requests.RequestException as e:
+        data = orjson.loads(resp.content)
+    except (httpx.HTTPError, ValueError) as e:
         logger.error(f"Trestle API error for {phone}: {e}")
+        _neg_put("trestle", clean_phone, _NEG_TTL_ERROR)
         return None
 
+    result = _parse_trestle(data, keep_raw=keep_raw)
+    with _CACHE_LOCK:
+        _TRESTLE_CACHE[clean_phone] = result
+    # A copy, so a caller popping raw_response or adding extras can't
+    # change what the next call gets from the cache
+    return dict(result)
+
+
+def _trestle_cache_clear():
+    """Drop all cached Trestle lookups."""
+    with _CACHE_LOCK:
+        _TRESTLE_CACHE.clear()
+
+
+trestle_reverse_phone.cache_clear = _trestle_cache_clear
+
+
+# Shape of a trestle_reverse_phone result. Copied per call, so defaults are
+# immutable — list fields are replaced, never appended to in place.
+_TRESTLE_RESULT_TEMPLATE = {
+    # Phone-level
+    "is_valid": None,
+    "line_type": "",
+    "carrier": None,
+    "is_prepaid": None,
+    "is_commercial": None,
+    "sms_eligible": False,
+
+    # Primary owner (populated from owners[0])
+    "owner_name": None,
+    "firstname": None,
+    "lastname": None,
+    "middlename": None,
+    "alternate_names": (),
+    "age_range": None,
+    "gender": None,
+    "owner_type": None,
+    "confidence_score": None,
+    "link_to_phone_start_date": None,
+
+    # Contact info
+    "candidate_email": None,
+    "all_emails": (),
+    "candidate_address": None,
+    "all_addresses": (),
+    "alternate_phones": (),
+
+    # Lat/long from Trestle address (before Google geocode)
+    "trestle_lat": None,
+    "trestle_lng": None,
+    "trestle_accuracy": None,
+
+    # Additional owners (for identity disambiguation)
+    "owner_count": 0,
+    "all_owners_summary": (),
+
+    "raw_response": None,
+}
+
+
+def _parse_trestle(data, keep_raw=True):
+    """Build the caller-intelligence dict from a Trestle phone response."""
     # Parse top-level phone fields
-    line_type_raw = (data.get("line_type") or "").lower()
-
-    result = {
-        # Phone-level
-        "is_valid": data.get("is_valid"),
-        "line_type": line_type_raw,
-        "carrier": data.get("carrier"),
-        "is_prepaid": data.get("is_prepaid"),
-        "is_commercial": data.get("is_commercial"),
-        "sms_eligible": line_type_raw == "mobile",
-
-        # Primary owner (populated below)
-        "owner_name": None,
-        "firstname": None,
-        "lastname": None,
-        "middlename": None,
-        "alternate_names": [],
-        "age_range": None,
-        "gender": None,
-        "owner_type": None,
-        "confidence_score": None,
-        "link_to_phone_start_date": None,
-
-        # Contact info
-        "candidate_email": None,
-        "all_emails": [],
-        "candidate_address": None,
-        "all_addresses": [],
-        "alternate_phones": [],
-
-        # Lat/long from Trestle address (before Google geocode)
-        "trestle_lat": None,
-        "trestle_lng": None,
-        "trestle_accuracy": None,
-
-        # Additional owners (for identity disambiguation)
-        "owner_count": 0,
-        "all_owners_summary": [],
-
-        "raw_response": data,
-    }
+    line_type_raw = _lower(data.get("line_type") or "")
+
+    result = _TRESTLE_RESULT_TEMPLATE.copy()
+    result["is_valid"] = data.get("is_valid")
+    result["line_type"] = line_type_raw
+    result["carrier"] = data.get("carrier")
+    result["is_prepaid"] = data.get("is_prepaid")
+    result["is_commercial"] = data.get("is_commercial")
+    result["sms_eligible"] = line_type_raw == "mobile"
+    if keep_raw:
+        result["raw_response"] = data
+
+    # Invalid number — owner data is meaningless, skip all of it.
+    # is_valid=None means Trestle didn't say, so keep going.
+    if result["is_valid"] is False:
+        return result
 
     owners = data.get("owners", [])
     result["owner_count"] = len(owners)
 
-    if not owners:
-        return result
-
-    # ── Primary owner (highest confidence) ───────────────────────
-    owner = owners[0]
-    result["owner_name"] = owner.get("name")
-    result["firstname"] = owner.get("firstname")
-    result["lastname"] = owner.get("lastname")
-    result["middlename"] = owner.get("middlename")
-    result["alternate_names"] = owner.get("alternate_names", [])
-    result["age_range"] = owner.get("age_range")
-    result["gender"] = owner.get("gender")
-    result["owner_type"] = owner.get("type")  # Person or Business
-    result["confidence_score"] = owner.get("phone_to_name_confidence_score")
-    result["link_to_phone_start_date"] = owner.get("link_to_phone_start_date")
-
-    # Emails — all of them, first one is candidate
-    all_emails = _parse_emails(owner.get("emails", []))
-    result["all_emails"] = all_emails
-    result["candidate_email"] = all_emails[0] if all_emails else None
-
-    # Addresses — all of them, first one is candidate
-    addresses = owner.get("current_addresses", [])
-    all_addrs = []
-    for addr in addresses:
-        formatted = _format_address(addr)
-        if formatted:
-            entry = {"formatted": formatted}
-            lat_long = addr.get("lat_long", {}) if isinstance(addr, dict) else {}
-            if lat_long:
-                entry["lat"] = lat_long.get("latitude")
-                entry["lng"] = lat_long.get("longitude")
-                entry["accuracy"] = lat_long.get("accuracy")
-            entry["delivery_point"] = addr.get("delivery_point") if isinstance(addr, dict) else None
-            entry["link_date"] = addr.get("link_to_person_start_date") if isinstance(addr, dict) else None
-            all_addrs.append(entry)
-    result["all_addresses"] = all_addrs
-    if all_addrs:
-        result["candidate_address"] = all_addrs[0]["formatted"]
-        result["trestle_lat"] = all_addrs[0].get("lat")
-        result["trestle_lng"] = all_addrs[0].get("lng")
-        result["trestle_accuracy"] = all_addrs[0].get("accuracy")
-
-    # Alternate phones
-    alt_phones = owner.get("alternate_phones", [])
-    result["alternate_phones"] = [
-        {"number": p.get("phoneNumber") or p.get("phone_number"),
-         "type": (p.get("lineType") or p.get("line_type") or "").lower()}
-        for p in alt_phones if isinstance(p, dict)
-    ]
+    # One pass: every owner feeds the summary, the first also fills the
+    # primary fields. Emails/addresses are parsed once per owner.
+    summary = []
+    for i, o in enumerate(owners):
+        all_emails = _parse_emails(o.get("emails", []))
+        addresses = o.get("current_addresses", [])
 
-    # ── All owners summary (for multi-owner numbers) ─────────────
-    for o in owners:
-        result["all_owners_summary"].append({
+        # ── All owners summary (for multi-owner numbers) ─────────
+        summary.append({
             "name": o.get("name"),
             "confidence": o.get("phone_to_name_confidence_score"),
             "type": o.get("type"),
             "age_range": o.get("age_range"),
-            "email_count": len(_parse_emails(o.get("emails", []))),
-            "address_count": len(o.get("current_addresses", [])),
+            "email_count": len(all_emails),
+            "address_count": len(addresses),
         })
-
+        if i:
+            continue
+
+        # ── Primary owner (highest confidence) ───────────────────
+        result["owner_name"] = o.get("name")
+        result["firstname"] = o.get("firstname")
+        result["lastname"] = o.get("lastname")
+        result["middlename"] = o.get("middlename")
+        result["alternate_names"] = o.get("alternate_names", [])
+        result["age_range"] = o.get("age_range")
+        result["gender"] = o.get("gender")
+        result["owner_type"] = o.get("type")  # Person or Business
+        result["confidence_score"] = o.get("phone_to_name_confidence_score")
+        result["link_to_phone_start_date"] = o.get("link_to_phone_start_date")
+
+        # Emails — all of them, first one is candidate
+        result["all_emails"] = all_emails
+        result["candidate_email"] = all_emails[0] if all_emails else None
+
+        # Addresses — all of them, first one is candidate
+        all_addrs = []
+        for addr in addresses:
+            formatted = _format_address(addr)
+            if formatted:
+                entry = {"formatted": formatted}
+                lat_long = addr.get("lat_long", {}) if isinstance(addr, dict) else {}
+                if lat_long:
+                    entry["lat"] = lat_long.get("latitude")
+                    entry["lng"] = lat_long.get("longitude")
+                    entry["accuracy"] = lat_long.get("accuracy")
+                entry["delivery_point"] = addr.get("delivery_point") if isinstance(addr, dict) else None
+                entry["link_date"] = addr.get("link_to_person_start_date") if isinstance(addr, dict) else None
+                all_addrs.append(entry)
+        result["all_addresses"] = all_addrs
+        if all_addrs:
+            result["candidate_address"] = all_addrs[0]["formatted"]
+            result["trestle_lat"] = all_addrs[0].get("lat")
+            result["trestle_lng"] = all_addrs[0].get("lng")
+            result["trestle_accuracy"] = all_addrs[0].get("accuracy")
+
+        # Alternate phones
+        result["alternate_phones"] = _parse_alternate_phones(o.get("alternate_phones"))
+
+    if summary:
+        result["all_owners_summary"] = summary
     return result
 
 
+# ── Concurrent enrichment ───────────────────────────────────────────
+
+def submit_trestle_lookup(phone, keep_raw=False):
+    """Start trestle_reverse_phone on the enrichment pool. Returns a Future."""
+    return _EXECUTOR.submit(trestle_reverse_phone, phone, keep_raw=keep_raw)
+
+
+def submit_zerobounce_validate(email):
+    """Start zerobounce_validate on the enrichment pool. Returns a Future."""
+    return _EXECUTOR.submit(zerobounce_validate, email)
+
+
+def geocode_and_validate(address):
+    """Geocode and Smarty-validate one address at the same time.
+
+    Returns (geocode, smarty) — None for either that failed.
+    """
+    # Smarty waits on its batcher while Google runs on the calling thread,
+    # so an enrichment holds no pool worker at all
+    smarty = submit_smarty_freeform(address)
+    return geocode_address(address), _smarty_wait(smarty)
+
+
 # ── ZeroBounce Email Validation ──────────────────────────────────────
 
 def zerobounce_validate(email):
@@ -201,21 +456,28 @@ def zerobounce_validate(email):
     }
 
     try:
-        resp = requests.get(url, params=params, timeout=10)
+        resp = _get(url, params=params)
         resp.raise_for_status()
-        data = resp.json()
-    except requests.RequestException as e:
+        data = orjson.loads(resp.content)
+    except (httpx.HTTPError, ValueError) as e:
         logger.error(f"ZeroBounce API error for {email}: {e}")
         return None
 
-    status = (data.get("status") or "").lower()
-    sub_status = (data.get("sub_status") or "").lower()
+    return _parse_zerobounce(data)
+
+
+# Sub-statuses that reject an address even when status isn't "invalid"
+_ZB_INVALID_SUB = frozenset({"disposable", "role_based", "toxic", "spam_trap"})
+
+
+def _parse_zerobounce(data):
+    """Reduce a ZeroBounce validate response to status flags."""
+    status = _lower(data.get("status") or "")
+    sub_status = _lower(data.get("sub_status") or "")
 
     # valid = proceed, invalid/disposable/role = reject, unknown/catch-all = flag
     is_valid = status == "valid"
-    is_invalid = status == "invalid" or sub_status in (
-        "disposable", "role_based", "toxic", "spam_trap"
-    )
+    is_invalid = status == "invalid" or sub_status in _ZB_INVALID_SUB
 
     return {
         "status": status,
@@ -234,6 +496,14 @@ def geocode_address(address):
         logger.warning("GOOGLE_MAPS_API_KEY not configured — skipping geocode")
         return None
 
+    key = address.strip().lower()
+    with _CACHE_LOCK:
+        cached = _GEO_CACHE.get(key)
+    if cached is not None:
+        return dict(cached)
+    if _neg_get("geocode", key) is not _NEG_MISS:
+        return None
+
     url = "https://maps.googleapis.com/maps/api/geocode/json"
     params = {
         "address": address,
@@ -241,13 +511,27 @@ def geocode_address(address):
     }
 
     try:
-        resp = requests.get(url, params=params, timeout=10)
+        resp = _get(url, params=params)
         resp.raise_for_status()
-        data = resp.json()
-    except requests.RequestException as e:
+        data = orjson.loads(resp.content)
+    except (httpx.HTTPError, ValueError) as e:
         logger.error(f"Google Maps geocode error: {e}")
+        _neg_put("geocode", key, _NEG_TTL_ERROR)
         return None
 
+    result = _parse_geocode(data)
+    if result is None:
+        _neg_put("geocode", key, _NEG_TTL_EMPTY)
+    else:
+        with _CACHE_LOCK:
+            _GEO_CACHE[key] = result
+        # Callers get their own copy so edits never reach the cache
+        result = dict(result)
+    return result
+
+
+def _parse_geocode(data):
+    """Pick the top Google geocode result. Returns dict or None."""
     results = data.get("results", [])
     if not results:
         return None
@@ -269,30 +553,160 @@ def geocode_address(address):
 
 def smarty_validate_address(street, city, state, zipcode=None):
     """Validate a US street address via Smarty API. Returns dict or None."""
+    key = (street.strip().lower(), city.strip().lower(), state.strip().upper(), (zipcode or "")[:5])
+    params = {"street": street, "city": city, "state": state}
+    if zipcode:
+        params["zipcode"] = zipcode
+    return _smarty_lookup(key, params)
+
+
+def smarty_validate_freeform(address):
+    """Validate a single-line US address via Smarty. Returns dict or None.
+
+    Smarty parses the whole address out of the street field, so this can
+    run on raw input without splitting it into components first.
+    """
+    return _smarty_wait(submit_smarty_freeform(address))
+
+
+def submit_smarty_freeform(address):
+    """Queue a freeform Smarty lookup on the batcher. Returns a Future.
+
+    Cache hits come back already resolved; misses resolve when their
+    batch does, without tying up a worker thread while they wait.
+    """
+    done = Future()
+    key = ("freeform", address.strip().lower())
+    cached = _smarty_cached(key)
+    if cached is not _NEG_MISS:
+        done.set_result(cached)
+        return done
+
+    def _finish(batch_future):
+        # Anything at all must resolve done, or its waiter hangs
+        try:
+            done.set_result(_smarty_store(key, batch_future.result()))
+        except Exception as e:
+            done.set_result(_smarty_failed(key, e))
+
+    _SMARTY_BATCHER.submit({"street": address}).add_done_callback(_finish)
+    return done
+
+
+# Longer than one batch window plus the client's own request timeout
+_SMARTY_WAIT_SECONDS = 15
+
+
+def _smarty_wait(future):
+    """Result of a submit_smarty_freeform Future, or None if it's late."""
+    try:
+        return future.result(timeout=_SMARTY_WAIT_SECONDS)
+    except TimeoutError:
+        logger.error("Smarty lookup timed out after %ss", _SMARTY_WAIT_SECONDS)
+        return None
+
+
+_SMARTY_URL = "https://us-street.api.smarty.com/street-address"
+
+
+def _smarty_auth():
+    return {"auth-id": config.SMARTY_AUTH_ID, "auth-token": config.SMARTY_AUTH_TOKEN}
+
+
+class _SmartyBatcher(_Batcher):
+    """Coalesce concurrent Smarty lookups into one POST of up to 100.
+
+    The wait is short because callers block on it; geocode_and_validate
+    runs Google alongside, which takes longer than the window anyway.
+    Each Future resolves to that address's candidate list.
+    """
+
+    name = "smarty-batcher"
+
+    def _send(self, batch):
+        body = [{**params, "candidates": 1} for params, _ in batch]
+        try:
+            resp = _HTTPX.post(_SMARTY_URL, params=_smarty_auth(), content=orjson.dumps(body),
+                               headers={"Content-Type": "application/json"})
+            resp.raise_for_status()
+            by_index = _split_smarty_batch(orjson.loads(resp.content), len(batch))
+        except (httpx.HTTPError, ValueError) as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        for (_, future), candidates in zip(batch, by_index):
+            future.set_result(candidates)
+
+
+def _split_smarty_batch(data, size):
+    """Group a batch response's candidates by input_index.
+
+    Raises ValueError on a body that isn't a list of candidate dicts.
+    Candidates without a valid input_index are dropped rather than
+    guessed at, so no caller gets another caller's address.
+    """
+    if type(data) is not list:
+        raise ValueError(f"Smarty batch response is {type(data).__name__}, not a list")
+    by_index = [[] for _ in range(size)]
+    for candidate in data:
+        if type(candidate) is not dict:
+            raise ValueError("Smarty batch response holds a non-object candidate")
+        i = candidate.get("input_index")
+        if type(i) is int and 0 <= i < size:
+            by_index[i].append(candidate)
+    return by_index
+
+
+_SMARTY_BATCHER = _SmartyBatcher(max_batch=100, max_wait_ms=20)
+
+
+def _smarty_cached(key):
+    """Cached result for key (None when unconfigured), or _NEG_MISS."""
     if not config.SMARTY_AUTH_ID or not config.SMARTY_AUTH_TOKEN:
         logger.warning("Smarty credentials not configured — skipping address validation")
         return None
 
-    url = "https://us-street.api.smarty.com/street-address"
-    params = {
-        "auth-id": config.SMARTY_AUTH_ID,
-        "auth-token": config.SMARTY_AUTH_TOKEN,
-        "street": street,
-        "city": city,
-        "state": state,
-        "candidates": 1,
-    }
-    if zipcode:
-        params["zipcode"] = zipcode
+    with _CACHE_LOCK:
+        cached = _SMARTY_CACHE.get(key)
+    if cached is None:
+        cached = _neg_get("smarty", key)
+    return dict(cached) if type(cached) is dict else cached
+
+
+def _smarty_store(key, data):
+    result = _parse_smarty(data)
+    if not data:
+        # No candidate — remember the DPV=N answer for a day, not a month
+        _neg_put("smarty", key, _NEG_TTL_SMARTY_N, result)
+    else:
+        with _CACHE_LOCK:
+            _SMARTY_CACHE[key] = result
+    return dict(result)
+
+
+def _smarty_failed(key, error):
+    logger.error("Smarty API error: %s", error)
+    _neg_put("smarty", key, _NEG_TTL_ERROR)
+    return None
+
+
+def _smarty_lookup(key, address_params):
+    cached = _smarty_cached(key)
+    if cached is not _NEG_MISS:
+        return cached
 
     try:
-        resp = requests.get(url, params=params, timeout=10)
+        resp = _get(_SMARTY_URL, params={**_smarty_auth(), **address_params, "candidates": 1})
         resp.raise_for_status()
-        data = resp.json()
-    except requests.RequestException as e:
-        logger.error(f"Smarty API error: {e}")
-        return None
+        data = orjson.loads(resp.content)
+    except (httpx.HTTPError, ValueError) as e:
+        return _smarty_failed(key, e)
+    return _smarty_store(key, data)
+
 
+def _parse_smarty(data):
+    """Reduce a Smarty candidate list to DPV code + normalized address."""
     if not data:
         return {"dpv_match_code": "N", "normalized": None, "raw_response": []}
 
@@ -315,22 +729,70 @@ def smarty_validate_address(street, city, state, zipcode=None):
 
 # ── Postmark Transactional Email ─────────────────────────────────
 
+def _postmark_headers():
+    return {
+        "Accept": "application/json",
+        "Content-Type": "application/json",
+        "X-Postmark-Server-Token": config.POSTMARK_SERVER_TOKEN,
+    }
+
+
+class _PostmarkBatcher(_Batcher):
+    """Coalesce concurrent Postmark sends into /email/batch requests."""
+
+    name = "postmark-batcher"
+    URL = "https://api.postmarkapp.com/email/batch"
+
+    def _fail(self, future, error):
+        future.set_result({"message_id": None, "success": False, "error": str(error)})
+
+    def _send(self, batch):
+        try:
+            resp = _HTTPX.post(
+                self.URL, content=orjson.dumps([p for p, _ in batch]),
+                headers=_postmark_headers(),
+            )
+            resp.raise_for_status()
+            data = orjson.loads(resp.content)
+        except (httpx.HTTPError, ValueError) as e:
+            logger.error(f"Postmark batch send error ({len(batch)} messages): {e}")
+            for _, future in batch:
+                future.set_result({"message_id": None, "success": False, "error": str(e)})
+            return
+
+        for i, (payload, future) in enumerate(batch):
+            if i < len(data):
+                future.set_result(_parse_postmark(data[i], payload["To"]))
+            else:
+                future.set_result({"message_id": None, "success": False, "error": "Missing batch result"})
+
+
+_POSTMARK_BATCHER = _PostmarkBatcher()
+# Don't drop confirmation emails still in the queue on shutdown
+atexit.register(_POSTMARK_BATCHER.drain)
+
+
 def postmark_send(to_email, subject, html_body, text_body=None):
     """Send a transactional email via Postmark API.
 
+    Goes through the batcher, so sends that land together share one POST.
     Returns dict with keys: message_id, success, error.
     Returns None on missing config.
     """
+    future = postmark_submit(to_email, subject, html_body, text_body)
+    return future.result() if future else None
+
+
+def postmark_submit(to_email, subject, html_body, text_body=None):
+    """Queue a Postmark send without waiting for it.
+
+    Returns a Future for the postmark_send result dict, or None on
+    missing config.
+    """
     if not config.POSTMARK_SERVER_TOKEN or not config.POSTMARK_FROM_EMAIL:
         logger.warning("Postmark not configured — skipping email send")
         return None
 
-    url = "https://api.postmarkapp.com/email"
-    headers = {
-        "Accept": "application/json",
-        "Content-Type": "application/json",
-        "X-Postmark-Server-Token": config.POSTMARK_SERVER_TOKEN,
-    }
     payload = {
         "From": config.POSTMARK_FROM_EMAIL,
         "To": to_email,
@@ -340,14 +802,11 @@ def postmark_send(to_email, subject, html_body, text_body=None):
     if text_body:
         payload["TextBody"] = text_body
 
-    try:
-        resp = requests.post(url, json=payload, headers=headers, timeout=10)
-        resp.raise_for_status()
-        data = resp.json()
-    except requests.RequestException as e:
-        logger.error(f"Postmark send error to {to_email}: {e}")
-        return {"message_id": None, "success": False, "error": str(e)}
+    return _POSTMARK_BATCHER.submit(payload)
+
 
+def _parse_postmark(data, to_email):
+    """Map a Postmark send response to message_id/success/error."""
     message_id = data.get("MessageID")
     error_code = data.get("ErrorCode", 0)
 
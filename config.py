@@ -16,6 +16,9 @@ SWML_BASIC_AUTH_PASSWORD = os.getenv("SWML_BASIC_AUTH_PASSWORD", "")
 # Trestle Reverse Phone API
 TRESTLE_API_KEY = os.getenv("TRESTLE_API_KEY", "")
 TRESTLE_BASE_URL = os.getenv("TRESTLE_BASE_URL", "https://api.trestleiq.com/3.2")
+# Start the Trestle lookup alongside the data store read. Saves a round
+# trip for new/stale callers, but fresh returning callers still get billed.
+SPECULATIVE_TRESTLE = os.getenv("SPECULATIVE_TRESTLE", "false").lower() in ("1", "true", "yes")
 
 # ZeroBounce Email Validation
 ZEROBOUNCE_API_KEY = os.getenv("ZEROBOUNCE_API_KEY", "")
@@ -38,6 +41,8 @@ AI_MODEL = os.getenv("AI_MODEL", "gpt-4o-mini")
 # Server
 HOST = os.getenv("HOST", "0.0.0.0")
 PORT = int(os.getenv("PORT", "3000"))
+# Pretty-print every rendered SWML document to stderr
+DEBUG_SWML = os.getenv("DEBUG_SWML", "false").lower() in ("1", "true", "yes")
 
 # Caller record TTL (days)
 TTL_ADDRESS_DAYS = int(os.getenv("TTL_ADDRESS_DAYS", "90"))
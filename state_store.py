@@ -2,20 +2,42 @@
 
 callers    — persistent, keyed by ANI (phone). Grows with call volume.
 call_state — ephemeral per-call. Heavy API responses. Deleted on hangup.
+call_state_delta — per-turn changes on top of a call_state snapshot.
 consent_log — append-only audit trail for SMS and email send consent.
+geocode_cache — enriched addresses by normalized input, kept for 30 days.
 """
 
-import json
+import atexit
 import logging
+import os
+import queue
 import sqlite3
+import threading
 import time
+import zlib
+from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from pathlib import Path
 
+import orjson
+from cachetools import TTLCache
+
+
+def _state_dumps(state):
+    return orjson.dumps(state, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+_state_loads = orjson.loads
+
 logger = logging.getLogger(__name__)
 
 DB_PATH = Path(__file__).parent / "veronica.db"
 
+# SQLite 3.45+ stores call_state as its binary JSONB format; older builds
+# keep plain JSON text in the same column.
+_HAS_JSONB = sqlite3.sqlite_version_info >= (3, 45, 0)
+
 _CREATE_TABLES = """
 CREATE TABLE IF NOT EXISTS callers (
     phone               TEXT PRIMARY KEY,
@@ -31,9 +53,13 @@ CREATE TABLE IF NOT EXISTS callers (
     dpv_match_code      TEXT,
     validated_email     TEXT,
     validated_address   TEXT,
-    trestle_raw         TEXT,
+    trestle_raw         BLOB,
+    trestle_extras_json TEXT,
     last_enriched_at    TEXT,
+    last_enrich_fail_at TEXT,
     last_call_at        TEXT,
+    latest_sms_consent  INTEGER,
+    latest_email_consent INTEGER,
     created_at          TEXT NOT NULL DEFAULT (datetime('now')),
     updated_at          TEXT NOT NULL DEFAULT (datetime('now'))
 );
@@ -41,11 +67,18 @@ CREATE TABLE IF NOT EXISTS callers (
 CREATE TABLE IF NOT EXISTS call_state (
     call_id             TEXT PRIMARY KEY,
     phone               TEXT,
-    state_json          TEXT NOT NULL DEFAULT '{}',
+    state_json          BLOB NOT NULL DEFAULT '{}',
     created_at          REAL NOT NULL,
     updated_at          REAL NOT NULL
 );
 
+CREATE TABLE IF NOT EXISTS call_state_delta (
+    call_id             TEXT NOT NULL,
+    seq                 INTEGER NOT NULL,
+    delta_json          TEXT NOT NULL,
+    PRIMARY KEY (call_id, seq)
+) WITHOUT ROWID;
+
 CREATE TABLE IF NOT EXISTS consent_log (
     id                  INTEGER PRIMARY KEY AUTOINCREMENT,
     phone               TEXT NOT NULL,
@@ -55,72 +88,330 @@ CREATE TABLE IF NOT EXISTS consent_log (
     transcript_snippet  TEXT,
     created_at          TEXT NOT NULL DEFAULT (datetime('now'))
 );
-CREATE INDEX IF NOT EXISTS idx_consent_phone ON consent_log(phone);
 CREATE INDEX IF NOT EXISTS idx_consent_call ON consent_log(call_id);
+CREATE INDEX IF NOT EXISTS idx_consent_phone_created ON consent_log(phone, created_at DESC);
+DROP INDEX IF EXISTS idx_consent_phone;
+CREATE INDEX IF NOT EXISTS idx_call_state_updated ON call_state(updated_at);
+
+CREATE TABLE IF NOT EXISTS geocode_cache (
+    address_key         TEXT PRIMARY KEY,
+    normalized          TEXT NOT NULL,
+    lat                 REAL,
+    lng                 REAL,
+    confidence          TEXT,
+    dpv_match_code      TEXT,
+    cached_at           REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_geocode_cached ON geocode_cache(cached_at);
+CREATE INDEX IF NOT EXISTS idx_callers_last_enriched ON callers(last_enriched_at);
 """
 
 
-def _connect():
-    """Open a new connection with WAL mode."""
-    conn = sqlite3.connect(str(DB_PATH), timeout=5)
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA journal_mode=WAL")
-    conn.executescript(_CREATE_TABLES)
+# ── Connections ──────────────────────────────────────────────────────
+# One read/write connection behind a lock, plus a small pool of read-only
+# connections. Opened once at import; the schema script runs once here
+# instead of on every query.
+
+# One reader per core, within reason — WAL lets them all read at once.
+_READER_COUNT = min(os.cpu_count() or 4, 8)
+
+# Applied once per connection when the pool is built.
+_WRITER_PRAGMAS = (
+    "auto_vacuum=INCREMENTAL",  # first: only sticks on a brand-new file
+    "journal_mode=WAL",
+    "synchronous=NORMAL",
+    "temp_store=MEMORY",
+    "cache_size=-65536",        # 64 MiB
+    "mmap_size=268435456",      # 256 MiB
+    "busy_timeout=5000",
+    "foreign_keys=ON",
+    "wal_autocheckpoint=1000",
+)
+_READER_PRAGMAS = (
+    "query_only=ON",
+    "cache_size=-65536",
+    "mmap_size=268435456",
+    "busy_timeout=5000",
+)
+_WRITER = None
+_WRITER_LOCK = threading.Lock()
+_READERS = queue.Queue(maxsize=_READER_COUNT)
+
+
+def _dict_factory(cursor, row):
+    """Build rows as plain dicts — what every reader returns anyway."""
+    return {d[0]: v for d, v in zip(cursor.description, row)}
+
+
+def _open(pragmas, uri=False, path=None, isolation_level="", row_factory=sqlite3.Row):
+    conn = sqlite3.connect(
+        path or str(DB_PATH), timeout=5, uri=uri,
+        check_same_thread=False, isolation_level=isolation_level,
+        cached_statements=256,
+    )
+    conn.row_factory = row_factory
+    for pragma in pragmas:
+        conn.execute(f"PRAGMA {pragma}")
     return conn
 
 
-# ── Callers ──────────────────────────────────────────────────────────
+# Columns added after the first release; CREATE TABLE IF NOT EXISTS won't
+# add them to an existing database, so they're ALTERed in when missing.
+_CALLER_MIGRATIONS = {
+    "latest_sms_consent": "INTEGER",
+    "latest_email_consent": "INTEGER",
+    "trestle_extras_json": "TEXT",
+    "last_enrich_fail_at": "TEXT",
+}
+
+
+# Columns derived from other tables are filled in when they're added, so
+# existing callers don't read NULL after an upgrade.
+_LATEST_CONSENT_BACKFILL = """UPDATE callers SET {column} = (
+    SELECT consented FROM consent_log
+    WHERE consent_log.phone = callers.phone AND consent_type = '{consent_type}'
+    ORDER BY created_at DESC, id DESC LIMIT 1)"""
+_CALLER_BACKFILLS = {
+    "latest_sms_consent": _LATEST_CONSENT_BACKFILL.format(
+        column="latest_sms_consent", consent_type="sms"),
+    "latest_email_consent": _LATEST_CONSENT_BACKFILL.format(
+        column="latest_email_consent", consent_type="email_send"),
+}
 
-def get_caller_by_phone(phone):
-    """Lookup a caller by phone number. Returns dict or None."""
-    conn = _connect()
+
+def _add_missing_columns(conn):
+    existing = {r["name"] for r in conn.execute("PRAGMA table_info(callers)")}
+    for name, decl in _CALLER_MIGRATIONS.items():
+        if name not in existing:
+            conn.execute(f"ALTER TABLE callers ADD COLUMN {name} {decl}")
+            if name in _CALLER_BACKFILLS:
+                conn.execute(_CALLER_BACKFILLS[name])
+            logger.info(f"Added callers.{name}")
+
+
+def _init_db():
+    """Open the writer, create the schema, then fill the reader pool."""
+    global _WRITER
+    # Autocommit mode: write_tx() issues BEGIN IMMEDIATE / COMMIT itself.
+    _WRITER = _open(_WRITER_PRAGMAS, isolation_level=None)
+    _WRITER.executescript(_CREATE_TABLES)
+    _add_missing_columns(_WRITER)
+    ro_uri = f"{DB_PATH.resolve().as_uri()}?mode=ro"
+    for _ in range(_READER_COUNT):
+        _READERS.put(_open(_READER_PRAGMAS, uri=True, path=ro_uri, row_factory=_dict_factory))
+
+
+@contextmanager
+def reader():
+    """Borrow a read-only connection from the pool."""
+    conn = _READERS.get()
     try:
-        row = conn.execute(
-            "SELECT * FROM callers WHERE phone = ?", (phone,)
-        ).fetchone()
-        return dict(row) if row else None
+        yield conn
     finally:
-        conn.close()
+        _READERS.put(conn)
 
 
-def upsert_caller(phone, **fields):
-    """Create or update a caller record. COALESCE preserves existing non-null values."""
-    allowed = {
-        "owner_name", "line_type", "sms_eligible", "candidate_email",
-        "candidate_address", "address_normalized", "geocode_lat", "geocode_lng",
-        "geocode_confidence", "dpv_match_code", "validated_email",
-        "validated_address", "trestle_raw", "last_enriched_at", "last_call_at",
-    }
-    filtered = {k: v for k, v in fields.items() if k in allowed}
+@contextmanager
+def writer():
+    """Hold the single read/write connection for the duration of the block."""
+    with _WRITER_LOCK:
+        yield _WRITER
 
-    conn = _connect()
-    try:
-        # Build dynamic upsert
-        columns = ["phone"] + list(filtered.keys()) + ["created_at", "updated_at"]
-        placeholders = ["?"] * len(columns)
-        values = [phone] + list(filtered.values()) + [
-            datetime.now(timezone.utc).isoformat(),
-            datetime.now(timezone.utc).isoformat(),
-        ]
 
-        conflict_sets = [f"{k} = COALESCE(excluded.{k}, callers.{k})" for k in filtered]
-        conflict_sets.append("updated_at = excluded.updated_at")
+@contextmanager
+def write_tx():
+    """Run the block in a BEGIN IMMEDIATE transaction on the writer.
 
-        sql = (
-            f"INSERT INTO callers ({', '.join(columns)}) "
-            f"VALUES ({', '.join(placeholders)}) "
-            f"ON CONFLICT(phone) DO UPDATE SET {', '.join(conflict_sets)}"
-        )
-        conn.execute(sql, values)
-        conn.commit()
-        logger.info(f"Upserted caller phone={phone}")
-        return get_caller_by_phone(phone)
-    finally:
-        conn.close()
+    Taking the write lock up front avoids SQLITE_BUSY on a read-to-write
+    upgrade when another process shares the database.
+    """
+    with writer() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+
+_init_db()
 
 
-def caller_is_stale(caller, ttl_days=180):
+# ── Callers ──────────────────────────────────────────────────────────
+
+# trestle_raw is the full Trestle response — tens of KB of JSON. It's
+# stored zlib-compressed and handed back already parsed; rows written
+# before compression still hold plain text and are parsed the same way.
+# trestle_extras_json is plain JSON text, also handed back parsed. Both
+# accept a dict on upsert and are serialized with the call-state encoder.
+
+def _encode_raw(text):
+    return zlib.compress(text.encode(), 6)
+
+
+def _decode_caller(caller):
+    raw = caller.get("trestle_raw")
+    if raw:
+        try:
+            if isinstance(raw, bytes):
+                raw = zlib.decompress(raw)
+            caller["trestle_raw"] = _state_loads(raw)
+        except (zlib.error, ValueError) as e:
+            logger.warning(f"Unreadable trestle_raw for {caller.get('phone')}: {e}")
+            caller["trestle_raw"] = None
+    extras = caller.get("trestle_extras_json")
+    if isinstance(extras, str):
+        try:
+            caller["trestle_extras_json"] = _state_loads(extras)
+        except ValueError as e:
+            logger.warning(f"Unreadable trestle_extras_json for {caller.get('phone')}: {e}")
+            caller["trestle_extras_json"] = None
+    return caller
+
+
+# Everything but trestle_raw. The raw blob spills onto overflow pages, so
+# it's only read when asked for: CALLER_COLUMNS + ("trestle_raw",).
+CALLER_COLUMNS = (
+    "phone", "owner_name", "line_type", "sms_eligible", "candidate_email",
+    "candidate_address", "address_normalized", "geocode_lat", "geocode_lng",
+    "geocode_confidence", "dpv_match_code", "validated_email",
+    "validated_address", "trestle_extras_json", "last_enriched_at",
+    "last_enrich_fail_at", "last_call_at", "created_at", "updated_at",
+    "latest_sms_consent", "latest_email_consent",
+)
+
+
+CALLER_TTL_DAYS = 180
+
+# Staleness computed by SQLite's date arithmetic; an unparseable or missing
+# last_enriched_at counts as stale, same as caller_is_stale.
+_IS_STALE_EXPR = (
+    "COALESCE(julianday('now') - julianday(last_enriched_at) > ?, 1) AS is_stale"
+)
+
+
+@lru_cache(maxsize=16)
+def _select_caller_sql(columns, with_staleness=False):
+    select = ", ".join(columns + (_IS_STALE_EXPR,) if with_staleness else columns)
+    return f"SELECT {select} FROM callers WHERE phone = ?"
+
+
+# Short-lived cache of caller rows, per phone and per (columns, staleness)
+# variant. Repeat dials skip the store; any write for the phone drops it.
+_CACHE_MISS = object()
+_caller_cache = TTLCache(maxsize=1024, ttl=300)
+_caller_cache_lock = threading.Lock()
+_caller_cache_gen = 0
+
+
+def get_caller_by_phone(phone, columns=CALLER_COLUMNS, stale_after_days=None):
+    """Lookup a caller by phone number. Returns dict or None.
+
+    columns is a tuple of column names; pass ("*",) for the full row.
+    With stale_after_days, the row also carries an is_stale flag that
+    caller_is_stale() reads instead of parsing last_enriched_at.
+    """
+    variant = (columns, stale_after_days)
+    with _caller_cache_lock:
+        hit = _caller_cache.get(phone, {}).get(variant, _CACHE_MISS)
+        gen = _caller_cache_gen
+    if hit is not _CACHE_MISS:
+        return dict(hit) if hit else None
+
+    if stale_after_days is None:
+        sql, params = _select_caller_sql(columns), (phone,)
+    else:
+        sql, params = _select_caller_sql(columns, True), (stale_after_days, phone)
+    with reader() as conn:
+        row = conn.execute(sql, params).fetchone()
+    caller = _decode_caller(row) if row else None
+
+    with _caller_cache_lock:
+        # Skip the fill if a write landed while we were reading
+        if gen == _caller_cache_gen:
+            _caller_cache.setdefault(phone, {})[variant] = caller
+    return dict(caller) if caller else None
+
+
+def _invalidate_caller(phone):
+    global _caller_cache_gen
+    with _caller_cache_lock:
+        _caller_cache.pop(phone, None)
+        _caller_cache_gen += 1
+
+
+_CALLER_FIELDS = frozenset({
+    "owner_name", "line_type", "sms_eligible", "candidate_email",
+    "candidate_address", "address_normalized", "geocode_lat", "geocode_lng",
+    "geocode_confidence", "dpv_match_code", "validated_email",
+    "validated_address", "trestle_raw", "trestle_extras_json",
+    "last_enriched_at", "last_enrich_fail_at", "last_call_at",
+})
+
+
+@lru_cache(maxsize=64)
+def _upsert_sql(fields, returning=True):
+    """Build the caller upsert for one ordered tuple of field names."""
+    columns = ("phone",) + fields + ("created_at", "updated_at")
+    conflict_sets = [f"{k} = COALESCE(excluded.{k}, callers.{k})" for k in fields]
+    conflict_sets.append("updated_at = excluded.updated_at")
+    sql = (
+        f"INSERT INTO callers ({', '.join(columns)}) "
+        f"VALUES ({', '.join('?' * len(columns))}) "
+        f"ON CONFLICT(phone) DO UPDATE SET {', '.join(conflict_sets)}"
+    )
+    return f"{sql} RETURNING {', '.join(CALLER_COLUMNS)}" if returning else sql
+
+
+# Timestamps are written at one-second resolution, so the formatted
+# string is reused for every write within the same second.
+_iso_now = (0, "")
+
+
+def utc_now_iso():
+    """Current UTC time as an ISO-8601 string, to the second."""
+    global _iso_now
+    sec = int(time.time())
+    cached = _iso_now
+    if cached[0] != sec:
+        cached = _iso_now = (sec, datetime.fromtimestamp(sec, timezone.utc).isoformat())
+    return cached[1]
+
+
+def upsert_caller(phone, returning=True, **fields):
+    """Create or update a caller record. COALESCE preserves existing non-null values.
+
+    Returns the stored row (CALLER_COLUMNS, without trestle_raw), or
+    None with returning=False for writers that don't need it back.
+    """
+    filtered = {k: v for k, v in fields.items() if k in _CALLER_FIELDS}
+    raw = filtered.get("trestle_raw")
+    if isinstance(raw, dict):
+        raw = _state_dumps(raw)
+    if isinstance(raw, str):
+        filtered["trestle_raw"] = _encode_raw(raw)
+    if isinstance(filtered.get("trestle_extras_json"), dict):
+        filtered["trestle_extras_json"] = _state_dumps(filtered["trestle_extras_json"])
+
+    # Keyed on the field order as passed, so values line up with the
+    # cached column list; each call site hits the same entry every time.
+    sql = _upsert_sql(tuple(filtered), returning)
+    now = utc_now_iso()
+    values = [phone, *filtered.values(), now, now]
+
+    with write_tx() as conn:
+        cur = conn.execute(sql, values)
+        row = cur.fetchone() if returning else None
+    _invalidate_caller(phone)
+    logger.info(f"Upserted caller phone={phone}")
+    return _decode_caller(dict(row)) if row else None
+
+
+def caller_is_stale(caller, ttl_days=CALLER_TTL_DAYS):
     """Check if a caller record needs re-enrichment."""
+    if "is_stale" in caller:
+        return bool(caller["is_stale"])
     enriched = caller.get("last_enriched_at")
     if not enriched:
         return True
@@ -131,6 +422,17 @@ def caller_is_stale(caller, ttl_days=180):
         return True
 
 
+def get_callers_missing_extras(limit=200):
+    """Callers enriched before trestle_extras_json existed, with their raw response."""
+    with reader() as conn:
+        rows = conn.execute(
+            "SELECT phone, trestle_raw FROM callers "
+            "WHERE trestle_extras_json IS NULL AND trestle_raw IS NOT NULL LIMIT ?",
+            (limit,),
+        ).fetchall()
+    return [_decode_caller(row) for row in rows]
+
+
 # ── Call State ───────────────────────────────────────────────────────
 
 DEFAULT_CALL_STATE = {
@@ -160,91 +462,322 @@ DEFAULT_CALL_STATE = {
 }
 
 
+# A call's state is a full snapshot in call_state plus the per-turn
+# changes since then in call_state_delta. Most turns touch one or two keys,
+# so only those are written; after _COMPACT_AFTER deltas the next save
+# writes a fresh snapshot and drops the call's deltas.
+_COMPACT_AFTER = 50
+_EACH = "jsonb_each" if _HAS_JSONB else "json_each"
+
+# Batches go in as one JSON array parameter fanned out by json_each, so
+# batch size never runs into SQLITE_MAX_VARIABLE_NUMBER. json_extract
+# rather than ->/->> keeps this working on JSON1 builds older than 3.38.
+_FLUSH_STATES_SQL = f"""INSERT INTO call_state (call_id, phone, state_json, created_at, updated_at)
+    SELECT json_extract(value, '$.call_id'), json_extract(value, '$.phone'),
+           {"jsonb(json_extract(value, '$.state'))" if _HAS_JSONB else "json_extract(value, '$.state')"},
+           json_extract(value, '$.ts'), json_extract(value, '$.ts')
+    FROM {_EACH}(?) WHERE true
+    ON CONFLICT(call_id) DO UPDATE SET
+        state_json = excluded.state_json,
+        updated_at = excluded.updated_at"""
+_CLEAR_DELTAS_SQL = f"""DELETE FROM call_state_delta
+    WHERE call_id IN (SELECT json_extract(value, '$.call_id') FROM {_EACH}(?))"""
+_FLUSH_DELTAS_SQL = f"""INSERT INTO call_state_delta (call_id, seq, delta_json)
+    SELECT json_extract(value, '$.call_id'), json_extract(value, '$.seq'),
+           json_extract(value, '$.delta')
+    FROM {_EACH}(?)"""
+
+# Write-behind buffer: save_call_state only records what changed; a
+# background thread commits whatever is dirty every ~100 ms, so several
+# saves in one turn cost a single transaction. Entries are replaced, never
+# mutated, so the flusher can tell whether one was re-saved mid-write.
+_FLUSH_INTERVAL = 0.1
+_dirty = {}                     # call_id -> (phone, is_full, state_or_delta, seq)
+_dirty_lock = threading.Lock()
+_dirty_event = threading.Event()
+_delta_counts = {}              # call_id -> deltas stored since the last snapshot
+
+# Merged state per live call. Loads within a call are served from here and
+# saves write through, so steady-state turns never touch call_state rows.
+# Bounded so calls that never reach on_summary don't pin their state until
+# the stale sweep; every save restarts the entry's TTL, and an evicted call
+# is simply re-read from the store (plus anything still buffered).
+_STATE_CACHE_MAX = 4096
+_STATE_CACHE_TTL = 1800
+_state_cache = TTLCache(maxsize=_STATE_CACHE_MAX, ttl=_STATE_CACHE_TTL)   # call_id -> merged state dict
+_state_cache_lock = threading.Lock()
+
+
 def load_call_state(call_id):
     """Return the state dict for a call, or defaults if missing."""
-    conn = _connect()
-    try:
+    with _state_cache_lock:
+        cached = _state_cache.get(call_id)
+    if cached is not None:
+        return cached.copy()
+
+    # Taken before the read: a flush landing in between only makes the
+    # buffered entry redundant, never lost.
+    with _dirty_lock:
+        pending = _dirty.get(call_id)
+    with reader() as conn:
         row = conn.execute(
-            "SELECT state_json FROM call_state WHERE call_id = ?", (call_id,)
+            "SELECT json(state_json) AS state_json FROM call_state WHERE call_id = ?", (call_id,)
         ).fetchone()
-        if row:
-            state = json.loads(row[0])
-            return {**DEFAULT_CALL_STATE, **state}
-        return dict(DEFAULT_CALL_STATE)
-    finally:
-        conn.close()
+        deltas = conn.execute(
+            "SELECT delta_json FROM call_state_delta WHERE call_id = ? ORDER BY seq", (call_id,)
+        ).fetchall() if row else ()
+    if not row and not pending:
+        return DEFAULT_CALL_STATE.copy()
+    state = DEFAULT_CALL_STATE | (_state_loads(row["state_json"]) if row else {})
+    for d in deltas:
+        state.update(_state_loads(d["delta_json"]))
+    # Evicted from the cache with a write still buffered
+    if pending:
+        state = DEFAULT_CALL_STATE | pending[2] if pending[1] else state | pending[2]
+    with _state_cache_lock:
+        # A save that raced this read wins
+        state = _state_cache.setdefault(call_id, state)
+        _delta_counts.setdefault(call_id, len(deltas))
+    return state.copy()
 
 
 def save_call_state(call_id, state, phone=None):
-    """Upsert the JSON blob for a call."""
-    now = time.time()
-    blob = json.dumps(state, default=str)
-    conn = _connect()
+    """Buffer a call's state; only keys that changed are written, in the background."""
+    merged = DEFAULT_CALL_STATE | state
+    with _state_cache_lock:
+        prev = _state_cache.get(call_id)
+        _state_cache[call_id] = merged
+        stored = _delta_counts.get(call_id, 0)
+
+    # First save, a dropped key, or too many deltas: write a full snapshot
+    full = prev is None or stored >= _COMPACT_AFTER or not prev.keys() <= merged.keys()
+    delta = None if full else {k: v for k, v in merged.items() if k not in prev or prev[k] != v}
+    if delta == {}:
+        return
+
+    with _dirty_lock:
+        pending = _dirty.get(call_id)
+        if pending:
+            if phone is None:
+                phone = pending[0]
+            if not full and pending[1]:
+                full = True                         # pending snapshot absorbs the delta
+            elif not full:
+                delta = pending[2] | delta
+        _dirty[call_id] = (phone, full, merged if full else delta, time.time_ns())
+    _dirty_event.set()
+
+
+def flush_call_states():
+    """Commit every buffered snapshot and delta in one transaction."""
+    # Snapshot under the writer lock so a concurrent delete can't slip in
+    # between the snapshot and the upsert and be undone by it.
+    with write_tx() as conn:
+        with _dirty_lock:
+            batch = list(_dirty.items())
+        fulls = [
+            {"call_id": cid, "phone": phone, "state": state, "ts": seq / 1e9}
+            for cid, (phone, is_full, state, seq) in batch if is_full
+        ]
+        deltas = [
+            {"call_id": cid, "seq": seq, "delta": delta}
+            for cid, (_, is_full, delta, seq) in batch if not is_full
+        ]
+        if fulls:
+            payload = _state_dumps(fulls)
+            conn.execute(_FLUSH_STATES_SQL, (payload,))
+            conn.execute(_CLEAR_DELTAS_SQL, (payload,))
+        if deltas:
+            conn.execute(_FLUSH_DELTAS_SQL, (_state_dumps(deltas),))
+    with _state_cache_lock:
+        for f in fulls:
+            _delta_counts[f["call_id"]] = 0
+        for d in deltas:
+            _delta_counts[d["call_id"]] = _delta_counts.get(d["call_id"], 0) + 1
+    # Drop only entries that weren't re-saved while we were writing.
+    with _dirty_lock:
+        for cid, entry in batch:
+            if _dirty.get(cid) is entry:
+                del _dirty[cid]
+
+
+# A failing flush is retried with backoff, so a persistent error (locked
+# or read-only file, unsupported SQL) doesn't spin and flood the log.
+_FLUSH_MAX_BACKOFF = 30
+
+
+def _flush_loop():
+    delay = _FLUSH_INTERVAL
+    while True:
+        _dirty_event.wait()
+        time.sleep(delay)
+        _dirty_event.clear()
+        try:
+            flush_call_states()
+        except sqlite3.Error as e:
+            if delay == _FLUSH_INTERVAL:
+                logger.error("Call state flush failed, retrying with backoff: %s", e)
+            delay = min(delay * 2, _FLUSH_MAX_BACKOFF)
+            _dirty_event.set()
+        else:
+            if delay != _FLUSH_INTERVAL:
+                logger.info("Call state flush recovered")
+            delay = _FLUSH_INTERVAL
+
+
+@contextmanager
+def call_state_session(call_id, phone=None):
+    """Load a call's state once and save it at most once, on exit.
+
+    Tools mutate the yielded dict freely; nothing is written unless it
+    differs from what was loaded, and then only the changed keys.
+    """
+    state = load_call_state(call_id)
+    loaded = state.copy()
     try:
-        conn.execute(
-            """INSERT INTO call_state (call_id, phone, state_json, created_at, updated_at)
-               VALUES (?, ?, ?, ?, ?)
-               ON CONFLICT(call_id) DO UPDATE SET
-                   state_json = excluded.state_json,
-                   updated_at = excluded.updated_at""",
-            (call_id, phone, blob, now, now),
-        )
-        conn.commit()
+        yield state
     finally:
-        conn.close()
+        if state != loaded:
+            # Apply only this session's changes on top of the latest state,
+            # so a background write (e.g. a Postmark message id) isn't undone
+            current = load_call_state(call_id)
+            current.update({k: v for k, v in state.items() if k not in loaded or loaded[k] != v})
+            for k in loaded.keys() - state.keys():
+                current.pop(k, None)
+            save_call_state(call_id, current, phone)
+
+
+def call_state_exists(call_id):
+    """True while a call has state: cached, buffered, or stored."""
+    with _state_cache_lock:
+        if call_id in _state_cache:
+            return True
+    with _dirty_lock:
+        if call_id in _dirty:
+            return True
+    with reader() as conn:
+        return conn.execute(
+            "SELECT 1 FROM call_state WHERE call_id = ?", (call_id,)
+        ).fetchone() is not None
 
 
 def delete_call_state(call_id):
     """Remove a call's state after the call ends."""
-    conn = _connect()
-    try:
+    with write_tx() as conn:
+        with _dirty_lock:
+            _dirty.pop(call_id, None)
         conn.execute("DELETE FROM call_state WHERE call_id = ?", (call_id,))
-        conn.commit()
-        logger.info(f"Deleted call state for call_id={call_id}")
-    finally:
-        conn.close()
+        conn.execute("DELETE FROM call_state_delta WHERE call_id = ?", (call_id,))
+    with _state_cache_lock:
+        _state_cache.pop(call_id, None)
+        _delta_counts.pop(call_id, None)
+    logger.info(f"Deleted call state for call_id={call_id}")
+
+
+def _close_db():
+    """Flush buffered state and let SQLite refresh statistics on shutdown."""
+    flush_call_states()
+    with writer() as conn:
+        conn.execute("PRAGMA optimize")
+
+
+threading.Thread(target=_flush_loop, name="call-state-flush", daemon=True).start()
+atexit.register(_close_db)
 
 
 def cleanup_stale_states(max_age_hours=24):
-    """Prune abandoned calls older than max_age_hours."""
+    """Prune abandoned calls older than max_age_hours, and expired geocodes."""
     cutoff = time.time() - (max_age_hours * 3600)
-    conn = _connect()
-    try:
-        cursor = conn.execute(
-            "DELETE FROM call_state WHERE updated_at < ?", (cutoff,)
+    with write_tx() as conn:
+        removed = conn.execute(
+            "DELETE FROM call_state WHERE updated_at < ? RETURNING call_id", (cutoff,)
+        ).fetchall()
+        conn.execute(
+            "DELETE FROM call_state_delta WHERE call_id NOT IN (SELECT call_id FROM call_state)"
+        )
+        conn.execute(
+            "DELETE FROM geocode_cache WHERE cached_at < ?",
+            (time.time() - GEOCODE_TTL_DAYS * 86400,),
+        )
+    # Housekeeping outside the transaction: hand back pages freed by the
+    # churn of short-lived call_state rows and refresh planner statistics.
+    with writer() as conn:
+        conn.execute("PRAGMA incremental_vacuum(100)").fetchall()
+        conn.execute("PRAGMA optimize")
+    if removed:
+        with _state_cache_lock:
+            for (call_id,) in removed:
+                _state_cache.pop(call_id, None)
+                _delta_counts.pop(call_id, None)
+        logger.info(f"Cleaned up {len(removed)} stale call states")
+
+
+# ── Geocode Cache ────────────────────────────────────────────────────
+# Second tier behind the in-process address cache in veronica.py, so
+# repeat addresses survive restarts without another Google + Smarty trip.
+
+GEOCODE_TTL_DAYS = 30
+
+
+def get_cached_geocode(address_key):
+    """Return (normalized, lat, lng, confidence, dpv_match_code) or None.
+
+    Rows without a usable DPV code (left by older versions) are ignored.
+    """
+    with reader() as conn:
+        row = conn.execute(
+            """SELECT normalized, lat, lng, confidence, dpv_match_code FROM geocode_cache
+               WHERE address_key = ? AND cached_at >= ?
+                 AND COALESCE(dpv_match_code, 'N') != 'N'""",
+            (address_key, time.time() - GEOCODE_TTL_DAYS * 86400),
+        ).fetchone()
+    if not row:
+        return None
+    return (row["normalized"], row["lat"], row["lng"], row["confidence"], row["dpv_match_code"])
+
+
+def cache_geocode(address_key, result):
+    """Store a successful enrichment tuple for address_key."""
+    with write_tx() as conn:
+        conn.execute(
+            """INSERT OR REPLACE INTO geocode_cache
+               (address_key, normalized, lat, lng, confidence, dpv_match_code, cached_at)
+               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            (address_key, *result, time.time()),
         )
-        conn.commit()
-        if cursor.rowcount:
-            logger.info(f"Cleaned up {cursor.rowcount} stale call states")
-    finally:
-        conn.close()
 
 
 # ── Consent Log ──────────────────────────────────────────────────────
 
+# UPDATE only: a consent answer must not create a bare callers row, or the
+# caller's next call would look like a refresh instead of a new caller
+_LATEST_CONSENT_SQL = {
+    consent_type: f"UPDATE callers SET {column} = ?, updated_at = ? WHERE phone = ?"
+    for consent_type, column in (("sms", "latest_sms_consent"),
+                                 ("email_send", "latest_email_consent"))
+}
+
+
 def log_consent(phone, call_id, consent_type, consented, transcript_snippet=None):
     """Append a consent record to the audit trail."""
-    conn = _connect()
-    try:
+    with write_tx() as conn:
         conn.execute(
             """INSERT INTO consent_log (phone, call_id, consent_type, consented, transcript_snippet)
                VALUES (?, ?, ?, ?, ?)""",
             (phone, call_id, consent_type, 1 if consented else 0, transcript_snippet),
         )
-        conn.commit()
-        logger.info(f"Logged consent: phone={phone} type={consent_type} consented={consented}")
-    finally:
-        conn.close()
+        # Keep the latest answer on the caller row so reads don't scan the log
+        if phone:
+            now = utc_now_iso()
+            conn.execute(_LATEST_CONSENT_SQL[consent_type], (1 if consented else 0, now, phone))
+    _invalidate_caller(phone)
+    logger.info(f"Logged consent: phone={phone} type={consent_type} consented={consented}")
 
 
 def get_consent_history(phone):
     """Return all consent records for a phone number."""
-    conn = _connect()
-    try:
-        rows = conn.execute(
+    with reader() as conn:
+        return conn.execute(
             "SELECT * FROM consent_log WHERE phone = ? ORDER BY created_at DESC",
             (phone,),
         ).fetchall()
-        return [dict(r) for r in rows]
-    finally:
-        conn.close()
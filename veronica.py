@@ -10,9 +10,16 @@ import json
 import logging
 import re
 import sys
-from datetime import datetime, timezone
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache, wraps
 from pathlib import Path
 
+import orjson
 from dotenv import load_dotenv
 from signalwire_agents import AgentBase
 from signalwire_agents.agent_server import AgentServer
@@ -20,13 +27,14 @@ from signalwire_agents.core.function_result import SwaigFunctionResult
 
 import config
 from api_clients import (
-    trestle_reverse_phone, zerobounce_validate, postmark_send,
-    geocode_address, smarty_validate_address,
+    trestle_reverse_phone, submit_trestle_lookup, zerobounce_validate,
+    submit_zerobounce_validate, postmark_submit, geocode_address, geocode_and_validate,
+    _parse_emails, _parse_alternate_phones,
 )
 from state_store import (
-    get_caller_by_phone, upsert_caller, caller_is_stale,
-    load_call_state, save_call_state, delete_call_state, cleanup_stale_states,
-    log_consent,
+    CALLER_TTL_DAYS, get_caller_by_phone, upsert_caller, caller_is_stale,
+    call_state_session, call_state_exists, delete_call_state, cleanup_stale_states,
+    log_consent, get_callers_missing_extras, get_cached_geocode, cache_geocode, utc_now_iso,
 )
 
 load_dotenv()
@@ -35,6 +43,50 @@ logger = logging.getLogger(__name__)
 
 config.validate()
 
+
+def _pretty_json(data):
+    """Indented JSON bytes for the call dumps and the SWML debug output."""
+    return orjson.dumps(data, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+
+
+# Enriched addresses by normalized input — household members and
+# businesses share addresses, and a hit skips both Google and Smarty.
+# Misses fall through to the store's geocode_cache before the APIs.
+_ADDRESS_CACHE_MAX = 4096
+_address_cache = OrderedDict()
+_address_cache_lock = threading.Lock()
+
+# Cache key: "123 Main Street." and "123 main st" are the same lookup
+_ADDRESS_PUNCT_RE = re.compile(r"[.,#]")
+_ZIP4_RE = re.compile(r"\b(\d{5})-\d{4}\b")
+_ADDRESS_WORDS = {
+    "STREET": "ST", "AVENUE": "AVE", "ROAD": "RD", "DRIVE": "DR",
+    "BOULEVARD": "BLVD", "LANE": "LN", "COURT": "CT", "PLACE": "PL",
+    "APARTMENT": "APT", "SUITE": "STE",
+}
+
+
+def _address_key(address):
+    """Normalize an address for cache lookups."""
+    text = _ZIP4_RE.sub(r"\1", _ADDRESS_PUNCT_RE.sub(" ", address.upper()))
+    return " ".join(_ADDRESS_WORDS.get(w, w) for w in text.split())
+
+
+# DPV codes not kept in memory: None means Smarty failed or is off, and N
+# already has its own one-day negative entry in api_clients
+_UNCACHED_DPV = (None, "N")
+
+
+def _remember_address(key, result):
+    if result[4] in _UNCACHED_DPV:
+        return
+    with _address_cache_lock:
+        _address_cache[key] = result
+        _address_cache.move_to_end(key)
+        if len(_address_cache) > _ADDRESS_CACHE_MAX:
+            _address_cache.popitem(last=False)
+
+
 # NATO phonetic alphabet for email readback
 NATO = {
     "A": "Alpha", "B": "Bravo", "C": "Charlie", "D": "Delta",
@@ -49,23 +101,44 @@ NATO = {
 }
 
 
+# Lowercase lookup for readback, including the email punctuation
+_NATO_LC = {k.lower(): v for k, v in NATO.items()}
+_NATO_LC.update({"@": "at", ".": "dot", "-": "dash", "_": "underscore"})
+
+
+# Confirmation loops re-submit the same spelling, so readbacks are cached
+@lru_cache(maxsize=256)
 def nato_spell_email(email):
     """Convert email to NATO phonetic spelling for voice readback."""
-    parts = []
-    for char in email.lower():
-        if char == "@":
-            parts.append("at")
-        elif char == ".":
-            parts.append("dot")
-        elif char == "-":
-            parts.append("dash")
-        elif char == "_":
-            parts.append("underscore")
-        elif char.upper() in NATO:
-            parts.append(NATO[char.upper()])
-        else:
-            parts.append(char)
-    return " ".join(parts)
+    return " ".join([_NATO_LC.get(c, c) for c in email.lower()])
+
+
+# Spoken-email rules as one alternation, so the text is scanned once.
+# Order matters: "at sign" before bare "at", and dot/period only fire when
+# the next word isn't a bare "at" (which owns the whitespace between them).
+_NORMALIZE_RE = re.compile(
+    r'\b(?:um|uh|like|so)\b'                                  # filler words
+    r'|\s*\bat\s*sign\b|\s+at\s+'                             # → @
+    r'|\b(?:dot|period)\s+(?!\s|at\s(?!\s*sign\b))'            # → .
+    r'|\bdash\b|\bhyphen\b'                                    # → -
+    r'|\bunderscore\b'                                         # → _
+    r'|\s+'                                                     # email has no spaces
+)
+# Keyed on the first two letters of the (left-stripped) match
+_NORMALIZE_MAP = {"at": "@", "do": ".", "pe": ".", "da": "-", "hy": "-", "un": "_"}
+
+
+# Basic shape check for a spelled email: something@something.tld
+_EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+# Common ASR slips on the TLD — only at the very end, so real domain
+# labels like "met" in "x@met.police.uk" are left alone
+_TLD_FIX_RE = re.compile(r'\.(con|nrt|ogr|cim|vom|met)$')
+_TLD_FIX_MAP = {"con": "com", "nrt": "net", "ogr": "org", "cim": "com", "vom": "com", "met": "net"}
+
+
+def _normalize_dispatch(m):
+    return _NORMALIZE_MAP.get(m.group(0).lstrip()[:2], "")
 
 
 def normalize_spoken_email(spoken):
@@ -76,23 +149,22 @@ def normalize_spoken_email(spoken):
     - 'dot com' → .com
     - 'dash' / 'hyphen' → -
     - 'underscore' → _
+    - obvious TLD slips ('.con' → '.com', '.nrt' → '.net', ...)
     """
-    text = spoken.lower().strip()
-    # Remove filler words
-    text = re.sub(r'\b(um|uh|like|so)\b', '', text)
-    # Normalize @ sign
-    text = re.sub(r'\bat\s*sign\b', '@', text)
-    text = re.sub(r'\s+at\s+', '@', text)
-    # Normalize dots
-    text = re.sub(r'\bdot\s+', '.', text)
-    text = re.sub(r'\bperiod\s+', '.', text)
-    # Normalize special chars
-    text = re.sub(r'\bdash\b', '-', text)
-    text = re.sub(r'\bhyphen\b', '-', text)
-    text = re.sub(r'\bunderscore\b', '_', text)
-    # Collapse whitespace and remove remaining spaces (email has none)
-    text = re.sub(r'\s+', '', text)
-    return text
+    email = _NORMALIZE_RE.sub(_normalize_dispatch, spoken.lower().strip())
+    return _TLD_FIX_RE.sub(lambda m: "." + _TLD_FIX_MAP[m.group(1)], email)
+
+
+# Copied into extras when truthy: name components (so Veronica can use a
+# first name naturally), demographics, carrier, and the full email/address/
+# phone lists the LLM can fall back on if the primary is rejected
+_EXTRAS_KEYS = (
+    "firstname", "lastname", "middlename", "alternate_names",
+    "age_range", "gender", "owner_type", "carrier",
+    "all_emails", "all_addresses", "alternate_phones",
+)
+# Copied whenever present — False/0 are meaningful here
+_EXTRAS_TRISTATE_KEYS = ("is_prepaid", "is_commercial", "confidence_score")
 
 
 def _extract_trestle_extras(trestle):
@@ -104,85 +176,220 @@ def _extract_trestle_extras(trestle):
     if not trestle:
         return {}
 
+    get = trestle.get
     extras = {}
-
-    # Name components — let Veronica use first name naturally
-    if trestle.get("firstname"):
-        extras["firstname"] = trestle["firstname"]
-    if trestle.get("lastname"):
-        extras["lastname"] = trestle["lastname"]
-    if trestle.get("middlename"):
-        extras["middlename"] = trestle["middlename"]
-    if trestle.get("alternate_names"):
-        extras["alternate_names"] = trestle["alternate_names"]
-
-    # Demographics
-    if trestle.get("age_range"):
-        extras["age_range"] = trestle["age_range"]
-    if trestle.get("gender"):
-        extras["gender"] = trestle["gender"]
-    if trestle.get("owner_type"):
-        extras["owner_type"] = trestle["owner_type"]
-
-    # Phone intel
-    if trestle.get("carrier"):
-        extras["carrier"] = trestle["carrier"]
-    if trestle.get("is_prepaid") is not None:
-        extras["is_prepaid"] = trestle["is_prepaid"]
-    if trestle.get("is_commercial") is not None:
-        extras["is_commercial"] = trestle["is_commercial"]
-    if trestle.get("confidence_score") is not None:
-        extras["confidence_score"] = trestle["confidence_score"]
-
-    # All emails (LLM can reference if primary is rejected)
-    if trestle.get("all_emails"):
-        extras["all_emails"] = trestle["all_emails"]
-
-    # All addresses with geocode data
-    if trestle.get("all_addresses"):
-        extras["all_addresses"] = trestle["all_addresses"]
-
-    # Alternate phones
-    if trestle.get("alternate_phones"):
-        extras["alternate_phones"] = trestle["alternate_phones"]
+    for k in _EXTRAS_KEYS:
+        v = get(k)
+        if v:
+            extras[k] = v
+    for k in _EXTRAS_TRISTATE_KEYS:
+        v = get(k)
+        if v is not None:
+            extras[k] = v
 
     # Multi-owner info
-    if trestle.get("owner_count", 0) > 1:
-        extras["owner_count"] = trestle["owner_count"]
-        extras["all_owners_summary"] = trestle.get("all_owners_summary", [])
+    owner_count = get("owner_count", 0)
+    if owner_count > 1:
+        extras["owner_count"] = owner_count
+        extras["all_owners_summary"] = get("all_owners_summary", [])
 
     return extras
 
 
+def _legacy_trestle_extras(raw_parsed):
+    """Rebuild extras from a stored raw Trestle response.
+
+    Only for records enriched before trestle_extras_json existed.
+    """
+    try:
+        # Build a minimal trestle-like dict for _extract_trestle_extras
+        owners = raw_parsed.get("owners", [])
+        if not owners:
+            return {}
+        o = owners[0]
+        pseudo_trestle = {
+            "firstname": o.get("firstname"),
+            "lastname": o.get("lastname"),
+            "middlename": o.get("middlename"),
+            "alternate_names": o.get("alternate_names", []),
+            "age_range": o.get("age_range"),
+            "gender": o.get("gender"),
+            "owner_type": o.get("type"),
+            "confidence_score": o.get("phone_to_name_confidence_score"),
+            "carrier": raw_parsed.get("carrier"),
+            "is_prepaid": raw_parsed.get("is_prepaid"),
+            "is_commercial": raw_parsed.get("is_commercial"),
+            "all_emails": _parse_emails(o.get("emails", [])),
+            "all_addresses": [],
+            "alternate_phones": _parse_alternate_phones(o.get("alternate_phones")),
+            "owner_count": len(owners),
+            "all_owners_summary": [
+                {"name": ow.get("name"), "confidence": ow.get("phone_to_name_confidence_score"),
+                 "type": ow.get("type"), "age_range": ow.get("age_range")}
+                for ow in owners
+            ],
+        }
+        return _extract_trestle_extras(pseudo_trestle)
+    except Exception as e:
+        logger.warning(f"  trestle_raw parse failed: {e}")
+        return {}
+
+
+def _backfill_trestle_extras():
+    """Store extras for every caller enriched before trestle_extras_json.
+
+    Runs once at startup so the returning-caller path never has to rebuild
+    them from trestle_raw.
+    """
+    total = 0
+    while batch := get_callers_missing_extras():
+        for row in batch:
+            # "{}" when nothing is recoverable, so the row isn't picked up again
+            extras = _legacy_trestle_extras(row["trestle_raw"]) if row["trestle_raw"] else {}
+            upsert_caller(row["phone"], returning=False, trestle_extras_json=extras)
+        total += len(batch)
+    if total:
+        logger.info(f"Backfilled Trestle extras for {total} callers")
+
+
 def _log_trestle(trestle):
-    """Log rich Trestle data during pre-call enrichment."""
-    if not trestle:
-        return
+    """Log rich Trestle data during pre-call enrichment.
 
-    logger.info(f"  trestle: name={trestle.get('owner_name')} "
-                f"({trestle.get('firstname')} {trestle.get('middlename', '')} {trestle.get('lastname')})")
-    logger.info(f"  trestle: type={trestle.get('owner_type')} "
-                f"confidence={trestle.get('confidence_score')} "
-                f"age={trestle.get('age_range')} gender={trestle.get('gender')}")
-    logger.info(f"  trestle: carrier={trestle.get('carrier')} "
-                f"prepaid={trestle.get('is_prepaid')} commercial={trestle.get('is_commercial')}")
-    logger.info(f"  trestle: emails={trestle.get('all_emails', [])}")
-    logger.info(f"  trestle: addresses={len(trestle.get('all_addresses', []))} on file")
-    for i, addr in enumerate(trestle.get("all_addresses", [])):
-        logger.info(f"  trestle:   [{i}] {addr.get('formatted')} "
-                    f"lat={addr.get('lat')} lng={addr.get('lng')}")
-    logger.info(f"  trestle: alt_phones={trestle.get('alternate_phones', [])}")
-    logger.info(f"  trestle: alt_names={trestle.get('alternate_names', [])}")
-    logger.info(f"  trestle: owners={trestle.get('owner_count', 0)}")
-    if trestle.get("owner_count", 0) > 1:
+    Summary lines go out at INFO; the per-address and per-owner detail
+    only at DEBUG.
+    """
+    if not trestle or not logger.isEnabledFor(logging.INFO):
+        return
+    debug = logger.isEnabledFor(logging.DEBUG)
+
+    logger.info("  trestle: name=%s (%s %s %s)",
+                trestle.get('owner_name'), trestle.get('firstname'), trestle.get('middlename', ''),
+                trestle.get('lastname'))
+    logger.info("  trestle: type=%s confidence=%s age=%s gender=%s",
+                trestle.get('owner_type'), trestle.get('confidence_score'),
+                trestle.get('age_range'), trestle.get('gender'))
+    logger.info("  trestle: carrier=%s prepaid=%s commercial=%s",
+                trestle.get('carrier'), trestle.get('is_prepaid'), trestle.get('is_commercial'))
+    logger.info("  trestle: emails=%s", trestle.get('all_emails', []))
+    logger.info("  trestle: addresses=%s on file", len(trestle.get('all_addresses', [])))
+    if debug:
+        for i, addr in enumerate(trestle.get("all_addresses", [])):
+            logger.debug("  trestle:   [%s] %s lat=%s lng=%s",
+                         i, addr.get('formatted'), addr.get('lat'), addr.get('lng'))
+    logger.info("  trestle: alt_phones=%s", trestle.get('alternate_phones', []))
+    logger.info("  trestle: alt_names=%s", trestle.get('alternate_names', []))
+    logger.info("  trestle: owners=%s", trestle.get('owner_count', 0))
+    if debug and trestle.get("owner_count", 0) > 1:
         for o in trestle.get("all_owners_summary", []):
-            logger.info(f"  trestle:   owner: {o.get('name')} "
-                        f"confidence={o.get('confidence')} type={o.get('type')}")
+            logger.debug("  trestle:   owner: %s confidence=%s type=%s",
+                         o.get('name'), o.get('confidence'), o.get('type'))
+
+
+# Confirmation email sent after email consent; only {owner_name} varies
+_CONFIRMATION_SUBJECT = "Mars Investigations — Confirmation"
+_CONFIRMATION_HTML = (
+    "<p>Hey {owner_name},</p>"
+    "<p>This is Veronica Mars confirming we've got your email on file.</p>"
+    "<p>If you didn't just speak with a sharp-tongued PI from Neptune, "
+    "someone's got some explaining to do.</p>"
+    "<p>— V</p>"
+    "<p><em>Mars Investigations</em></p>"
+)
+_CONFIRMATION_TEXT = (
+    "Hey {owner_name},\n\n"
+    "This is Veronica Mars confirming we've got your email on file.\n\n"
+    "If you didn't just speak with a sharp-tongued PI from Neptune, "
+    "someone's got some explaining to do.\n\n"
+    "— V\n"
+    "Mars Investigations"
+)
+
+
+@dataclass(slots=True)
+class EnrichmentResult:
+    """What pre-call enrichment learned about the caller."""
+
+    owner_name: str | None = None
+    candidate_email: str | None = None
+    candidate_address: str | None = None
+    address_normalized: str | None = None
+    geocode_lat: float | None = None
+    geocode_lng: float | None = None
+    geocode_confidence: str | None = None
+    dpv_match_code: str | None = None
+    line_type: str | None = None
+    sms_eligible: bool = False
+    record_source: str = "new"
+    trestle_extras: dict = field(default_factory=dict)
+
+    def set_address(self, enriched):
+        """Take the (normalized, lat, lng, confidence, dpv) tuple from _enrich_address."""
+        (self.address_normalized, self.geocode_lat, self.geocode_lng,
+         self.geocode_confidence, self.dpv_match_code) = enriched
+
+    def address_fields(self):
+        """Geocode/USPS columns for upsert_caller."""
+        return {
+            "address_normalized": self.address_normalized,
+            "geocode_lat": self.geocode_lat,
+            "geocode_lng": self.geocode_lng,
+            "geocode_confidence": self.geocode_confidence,
+            "dpv_match_code": self.dpv_match_code,
+        }
+
+
+# A stale caller whose re-enrichment failed this recently keeps the stored
+# record instead of retrying Trestle on every back-to-back call
+_ENRICH_FAIL_BACKOFF = timedelta(seconds=60)
+
+
+def _recent_enrich_failure(caller, now):
+    failed_at = caller.get("last_enrich_fail_at")
+    if not failed_at:
+        return False
+    try:
+        return now - datetime.fromisoformat(failed_at) < _ENRICH_FAIL_BACKOFF
+    except (ValueError, TypeError):
+        return False
+
+
+def _result_from_caller(caller, record_source):
+    """Build an EnrichmentResult from a stored caller record."""
+    return EnrichmentResult(
+        owner_name=caller.get("owner_name"),
+        candidate_email=caller.get("validated_email") or caller.get("candidate_email"),
+        candidate_address=caller.get("address_normalized") or caller.get("candidate_address"),
+        address_normalized=caller.get("address_normalized"),
+        geocode_lat=caller.get("geocode_lat"),
+        geocode_lng=caller.get("geocode_lng"),
+        geocode_confidence=caller.get("geocode_confidence"),
+        dpv_match_code=caller.get("dpv_match_code"),
+        line_type=caller.get("line_type"),
+        sms_eligible=bool(caller.get("sms_eligible")),
+        record_source=record_source,
+    )
 
 
 class VeronicaAgent(AgentBase):
     """Veronica Mars — AI voice agent for email & address collection."""
 
+    # Greeting step copy per caller type: (task, bullets); {name} is the owner name
+    _GREETING_RETURNING = ("Welcome back a returning caller", (
+        "You remember {name}. Reference the prior contact naturally.",
+        "Confirm identity: 'Am I speaking with {name}?'",
+        "Call confirm_identity with the result",
+    ))
+    _GREETING_RESEARCHED = ("Greet a new caller you've already researched", (
+        "You pulled the file on this number. You've got {name}.",
+        "Confirm identity: 'Am I speaking with {name}?'",
+        "Call confirm_identity with the result",
+    ))
+    _GREETING_UNKNOWN = ("Greet an unknown caller", (
+        "No name on file. Greet generically but in character.",
+        "'Mars Investigations. Veronica Mars speaking. Who am I talking to?'",
+        "Call confirm_identity with their response",
+    ))
+
     def __init__(self):
         super().__init__(
             name="veronica-mars",
@@ -384,22 +591,37 @@ class VeronicaAgent(AgentBase):
     # ── Address Enrichment ────────────────────────────────────────────
 
     def _enrich_address(self, address):
-        """Geocode via Google Maps, then USPS-validate via Smarty.
+        """Geocode via Google Maps and USPS-validate via Smarty, concurrently.
 
         Returns (normalized, lat, lng, confidence, dpv_match_code).
         All None if no address or APIs unconfigured.
         """
         if not address:
-            logger.info(f"  geocode: no address to geocode")
+            logger.info("  geocode: no address to geocode")
             return None, None, None, None, None
 
-        # Google Maps Geocoding
-        geo = geocode_address(address)
+        key = _address_key(address)
+        with _address_cache_lock:
+            cached = _address_cache.get(key)
+            if cached:
+                _address_cache.move_to_end(key)
+        if not cached:
+            cached = get_cached_geocode(key)
+            if cached:
+                _remember_address(key, cached)
+        if cached:
+            logger.info("  geocode: cache hit → %s", cached[0])
+            return cached
+
+        # Smarty takes the raw single-line address, so it doesn't have to
+        # wait for Google's formatted result to be split into components
+        geo, smarty = geocode_and_validate(address)
         if geo:
-            logger.info(f"  geocode: OK → {geo['formatted_address']}")
-            logger.info(f"  geocode: lat={geo['lat']} lng={geo['lng']} confidence={geo['confidence']}")
+            logger.info("  geocode: OK → %s", geo['formatted_address'])
+            logger.info("  geocode: lat=%s lng=%s confidence=%s",
+                        geo['lat'], geo['lng'], geo['confidence'])
         else:
-            logger.info(f"  geocode: FAILED or not configured for '{address}'")
+            logger.info("  geocode: FAILED or not configured for '%s'", address)
             return None, None, None, None, None
 
         normalized = geo["formatted_address"]
@@ -407,31 +629,24 @@ class VeronicaAgent(AgentBase):
         lng = geo["lng"]
         confidence = geo["confidence"]
 
-        # Smarty USPS validation — parse the geocoded address
-        # Google returns "123 Main St, City, ST 12345, USA" format
+        # Prefer the USPS form when Smarty confirmed the delivery point
         dpv = None
-        parts = [p.strip() for p in normalized.split(",")]
-        if len(parts) >= 3:
-            street = parts[0]
-            city = parts[1]
-            # State + zip might be "CA 90210" or just "CA"
-            state_zip = parts[2].replace("USA", "").strip()
-            state_parts = state_zip.split()
-            state = state_parts[0] if state_parts else ""
-            zipcode = state_parts[1] if len(state_parts) > 1 else None
-
-            smarty = smarty_validate_address(street, city, state, zipcode)
-            if smarty:
-                dpv = smarty["dpv_match_code"]
-                if smarty.get("normalized"):
-                    normalized = smarty["normalized"]
-                logger.info(f"  smarty: dpv={dpv} normalized={normalized}")
-            else:
-                logger.info(f"  smarty: FAILED or not configured")
+        if smarty:
+            dpv = smarty["dpv_match_code"]
+            if dpv == "Y" and smarty.get("normalized"):
+                normalized = smarty["normalized"]
+            logger.info("  smarty: dpv=%s normalized=%s", dpv, normalized)
         else:
-            logger.info(f"  smarty: skipped — couldn't parse geocoded address into components")
+            logger.info("  smarty: FAILED or not configured")
 
-        return normalized, lat, lng, confidence, dpv
+        result = (normalized, lat, lng, confidence, dpv)
+        # A Smarty failure (dpv None) would pass validate_address for the
+        # whole cache TTL, and DPV=N is only trusted for a day — neither
+        # is stored, so the next call asks again
+        if dpv not in _UNCACHED_DPV:
+            _remember_address(key, result)
+            cache_geocode(key, result)
+        return result
 
     # ── Per-Call Config ──────────────────────────────────────────────
 
@@ -453,262 +668,176 @@ class VeronicaAgent(AgentBase):
             return
 
         call_id = call_data.get("id", "unknown")
+        now = datetime.now(timezone.utc)
+        now_iso = utc_now_iso()
 
-        logger.info(f"━━━ PRE-CALL ENRICHMENT ━━━ phone={caller_phone} call_id={call_id}")
+        logger.info("━━━ PRE-CALL ENRICHMENT ━━━ phone=%s call_id=%s", caller_phone, call_id)
+
+        # Optionally overlap the Trestle call with the store read; a fresh
+        # returning caller just ignores the result
+        trestle_future = (
+            submit_trestle_lookup(caller_phone, keep_raw=True)
+            if config.SPECULATIVE_TRESTLE else None
+        )
 
         # ── Data store lookup ────────────────────────────────────────
-        caller = get_caller_by_phone(caller_phone) if caller_phone else None
-        logger.info(f"  data_store: {'HIT' if caller else 'MISS'} for {caller_phone}")
-
-        owner_name = None
-        candidate_email = None
-        candidate_address = None
-        address_normalized = None
-        geocode_lat = None
-        geocode_lng = None
-        geocode_confidence = None
-        dpv_match_code = None
-        line_type = None
-        sms_eligible = False
-        record_source = "new"
+        caller = (
+            get_caller_by_phone(caller_phone, stale_after_days=CALLER_TTL_DAYS)
+            if caller_phone else None
+        )
+        logger.info("  data_store: %s for %s", 'HIT' if caller else 'MISS', caller_phone)
+
+        # Caller-record changes, written in one upsert once the path is decided
+        pending_updates = {}
 
         if caller and not caller_is_stale(caller):
             # RETURNING + FRESH — use stored record
-            owner_name = caller.get("owner_name")
-            candidate_email = caller.get("validated_email") or caller.get("candidate_email")
-            candidate_address = caller.get("address_normalized") or caller.get("candidate_address")
-            address_normalized = caller.get("address_normalized")
-            geocode_lat = caller.get("geocode_lat")
-            geocode_lng = caller.get("geocode_lng")
-            geocode_confidence = caller.get("geocode_confidence")
-            dpv_match_code = caller.get("dpv_match_code")
-            line_type = caller.get("line_type")
-            sms_eligible = bool(caller.get("sms_eligible"))
-            record_source = "returning"
-            # Rebuild extras from stored Trestle raw data so LLM gets rich context
-            trestle_extras = {}
-            stored_raw = caller.get("trestle_raw")
-            if stored_raw:
-                try:
-                    raw_parsed = json.loads(stored_raw) if isinstance(stored_raw, str) else stored_raw
-                    # Build a minimal trestle-like dict for _extract_trestle_extras
-                    from api_clients import _parse_emails, _format_address
-                    owners = raw_parsed.get("owners", [])
-                    if owners:
-                        o = owners[0]
-                        pseudo_trestle = {
-                            "firstname": o.get("firstname"),
-                            "lastname": o.get("lastname"),
-                            "middlename": o.get("middlename"),
-                            "alternate_names": o.get("alternate_names", []),
-                            "age_range": o.get("age_range"),
-                            "gender": o.get("gender"),
-                            "owner_type": o.get("type"),
-                            "confidence_score": o.get("phone_to_name_confidence_score"),
-                            "carrier": raw_parsed.get("carrier"),
-                            "is_prepaid": raw_parsed.get("is_prepaid"),
-                            "is_commercial": raw_parsed.get("is_commercial"),
-                            "all_emails": _parse_emails(o.get("emails", [])),
-                            "all_addresses": [],
-                            "alternate_phones": [
-                                {"number": p.get("phoneNumber") or p.get("phone_number"),
-                                 "type": (p.get("lineType") or p.get("line_type") or "").lower()}
-                                for p in o.get("alternate_phones", []) if isinstance(p, dict)
-                            ],
-                            "owner_count": len(owners),
-                            "all_owners_summary": [
-                                {"name": ow.get("name"), "confidence": ow.get("phone_to_name_confidence_score"),
-                                 "type": ow.get("type"), "age_range": ow.get("age_range")}
-                                for ow in owners
-                            ],
-                        }
-                        trestle_extras = _extract_trestle_extras(pseudo_trestle)
-                except Exception as e:
-                    logger.warning(f"  trestle_raw parse failed: {e}")
-            logger.info(f"  path: RETURNING (fresh)")
-            logger.info(f"  stored: name={owner_name} email={candidate_email} address={candidate_address}")
-            logger.info(f"  stored: geocode={geocode_lat},{geocode_lng} confidence={geocode_confidence} dpv={dpv_match_code}")
+            r = _result_from_caller(caller, "returning")
+            # Rich Trestle context for the LLM, stored at enrichment time
+            stored_extras = caller.get("trestle_extras_json")
+            if stored_extras:
+                r.trestle_extras = stored_extras
+            logger.info("  path: RETURNING (fresh)")
+            logger.info("  stored: name=%s email=%s address=%s",
+                        r.owner_name, r.candidate_email, r.candidate_address)
+            logger.info("  stored: geocode=%s,%s confidence=%s dpv=%s",
+                        r.geocode_lat, r.geocode_lng, r.geocode_confidence, r.dpv_match_code)
 
             # Backfill geocode if we have an address but no geocode data
             raw_address = caller.get("candidate_address")
-            if raw_address and not geocode_lat:
-                logger.info(f"  geocode: BACKFILL — address on file but never geocoded")
-                address_normalized, geocode_lat, geocode_lng, geocode_confidence, dpv_match_code = \
-                    self._enrich_address(raw_address)
-                if geocode_lat:
-                    upsert_caller(caller_phone,
-                        address_normalized=address_normalized,
-                        geocode_lat=geocode_lat,
-                        geocode_lng=geocode_lng,
-                        geocode_confidence=geocode_confidence,
-                        dpv_match_code=dpv_match_code,
-                    )
-                    candidate_address = address_normalized or candidate_address
+            if raw_address and not r.geocode_lat:
+                logger.info("  geocode: BACKFILL — address on file but never geocoded")
+                r.set_address(self._enrich_address(raw_address))
+                if r.geocode_lat:
+                    pending_updates.update(r.address_fields())
+                    r.candidate_address = r.address_normalized or r.candidate_address
             else:
-                logger.info(f"  API calls: NONE (fresh record, geocode present)")
+                logger.info("  API calls: NONE (fresh record, geocode present)")
 
-        elif caller and caller_is_stale(caller):
-            # RETURNING + STALE — re-enrich
-            record_source = "refreshed"
-            logger.info(f"  path: RETURNING (stale) — re-enriching")
-
-            trestle = trestle_reverse_phone(caller_phone)
-            logger.info(f"  trestle: {'OK' if trestle else 'FAILED'}")
-            trestle_extras = {}
+        else:
+            if caller:
+                # RETURNING + STALE — re-enrich
+                logger.info("  path: RETURNING (stale) — re-enriching")
+            else:
+                # NEW CALLER — full Trestle enrichment
+                logger.info("  path: NEW CALLER — full enrichment")
+
+            if caller and _recent_enrich_failure(caller, now):
+                # Trestle just failed for this caller — don't hammer it again
+                logger.info("  trestle: SKIPPED — failed within the last %ss",
+                            _ENRICH_FAIL_BACKOFF.seconds)
+                trestle = None
+            else:
+                trestle = (
+                    trestle_future.result() if trestle_future
+                    else trestle_reverse_phone(caller_phone, keep_raw=True)
+                )
+                logger.info("  trestle: %s", 'OK' if trestle else 'FAILED')
+                if not trestle and caller:
+                    pending_updates["last_enrich_fail_at"] = now_iso
             if trestle:
-                owner_name = trestle["owner_name"] or caller.get("owner_name")
-                candidate_email = trestle["candidate_email"] or caller.get("validated_email") or caller.get("candidate_email")
-                candidate_address = trestle["candidate_address"] or caller.get("address_normalized") or caller.get("candidate_address")
-                line_type = trestle["line_type"] or caller.get("line_type")
-                sms_eligible = trestle["sms_eligible"]
-                trestle_extras = _extract_trestle_extras(trestle)
+                r = EnrichmentResult(
+                    owner_name=trestle["owner_name"],
+                    candidate_email=trestle["candidate_email"],
+                    candidate_address=trestle["candidate_address"],
+                    line_type=trestle["line_type"],
+                    sms_eligible=trestle["sms_eligible"],
+                    record_source="refreshed" if caller else "new",
+                    trestle_extras=_extract_trestle_extras(trestle),
+                )
+                if caller:
+                    # Keep what we already had where Trestle came back empty
+                    r.owner_name = r.owner_name or caller.get("owner_name")
+                    r.candidate_email = (r.candidate_email or caller.get("validated_email")
+                                         or caller.get("candidate_email"))
+                    r.candidate_address = (r.candidate_address or caller.get("address_normalized")
+                                           or caller.get("candidate_address"))
+                    r.line_type = r.line_type or caller.get("line_type")
                 _log_trestle(trestle)
 
                 # Geocode + Smarty if we got an address
-                address_normalized, geocode_lat, geocode_lng, geocode_confidence, dpv_match_code = \
-                    self._enrich_address(candidate_address)
+                r.set_address(self._enrich_address(r.candidate_address))
 
-                upsert_caller(caller_phone,
-                    owner_name=owner_name,
-                    line_type=line_type,
-                    sms_eligible=sms_eligible,
+                pending_updates.update(
+                    owner_name=r.owner_name,
+                    line_type=r.line_type,
+                    sms_eligible=r.sms_eligible,
                     candidate_email=trestle["candidate_email"],
                     candidate_address=trestle["candidate_address"],
-                    address_normalized=address_normalized,
-                    geocode_lat=geocode_lat,
-                    geocode_lng=geocode_lng,
-                    geocode_confidence=geocode_confidence,
-                    dpv_match_code=dpv_match_code,
-                    trestle_raw=json.dumps(trestle["raw_response"]),
-                    last_enriched_at=datetime.now(timezone.utc).isoformat(),
-                    last_call_at=datetime.now(timezone.utc).isoformat(),
+                    **r.address_fields(),
+                    trestle_raw=trestle["raw_response"],
+                    trestle_extras_json=r.trestle_extras,
+                    last_enriched_at=now_iso,
+                    last_call_at=now_iso,
                 )
-            else:
+            elif caller:
                 # Trestle failed, use stale record
-                owner_name = caller.get("owner_name")
-                candidate_email = caller.get("validated_email") or caller.get("candidate_email")
-                candidate_address = caller.get("address_normalized") or caller.get("candidate_address")
-                address_normalized = caller.get("address_normalized")
-                geocode_lat = caller.get("geocode_lat")
-                geocode_lng = caller.get("geocode_lng")
-                geocode_confidence = caller.get("geocode_confidence")
-                dpv_match_code = caller.get("dpv_match_code")
-                line_type = caller.get("line_type")
-                sms_eligible = bool(caller.get("sms_eligible"))
-                logger.info(f"  trestle: FAILED — falling back to stale record")
-
-        else:
-            # NEW CALLER — full Trestle enrichment
-            logger.info(f"  path: NEW CALLER — full enrichment")
-            trestle = trestle_reverse_phone(caller_phone) if caller_phone else None
-            logger.info(f"  trestle: {'OK' if trestle else 'FAILED'}")
-            trestle_extras = {}
-            if trestle:
-                owner_name = trestle["owner_name"]
-                candidate_email = trestle["candidate_email"]
-                candidate_address = trestle["candidate_address"]
-                line_type = trestle["line_type"]
-                sms_eligible = trestle["sms_eligible"]
-                trestle_extras = _extract_trestle_extras(trestle)
-                _log_trestle(trestle)
-
-                # Geocode + Smarty if we got an address
-                address_normalized, geocode_lat, geocode_lng, geocode_confidence, dpv_match_code = \
-                    self._enrich_address(candidate_address)
-
-                upsert_caller(caller_phone,
-                    owner_name=owner_name,
-                    line_type=line_type,
-                    sms_eligible=sms_eligible,
-                    candidate_email=candidate_email,
-                    candidate_address=candidate_address,
-                    address_normalized=address_normalized,
-                    geocode_lat=geocode_lat,
-                    geocode_lng=geocode_lng,
-                    geocode_confidence=geocode_confidence,
-                    dpv_match_code=dpv_match_code,
-                    trestle_raw=json.dumps(trestle["raw_response"]),
-                    last_enriched_at=datetime.now(timezone.utc).isoformat(),
-                    last_call_at=datetime.now(timezone.utc).isoformat(),
-                )
+                r = _result_from_caller(caller, "refreshed")
+                logger.info("  trestle: FAILED — falling back to stale record")
             else:
-                logger.info(f"  trestle: FAILED or no phone — no enrichment data")
+                r = EnrichmentResult()
+                logger.info("  trestle: FAILED or no phone — no enrichment data")
+
+        if pending_updates:
+            upsert_caller(caller_phone, returning=False, **pending_updates)
 
         # ── Summary ──────────────────────────────────────────────────
-        display_address = address_normalized or candidate_address
-        logger.info(f"  ── ENRICHMENT RESULT ──")
-        logger.info(f"  name:     {owner_name or '(none)'}")
-        logger.info(f"  email:    {candidate_email or '(none)'}")
-        logger.info(f"  address:  {display_address or '(none)'}")
-        logger.info(f"  geocode:  {geocode_lat},{geocode_lng} confidence={geocode_confidence or '(none)'}")
-        logger.info(f"  dpv:      {dpv_match_code or '(none)'}")
-        logger.info(f"  line:     {line_type or '(none)'} sms={sms_eligible}")
-        logger.info(f"  source:   {record_source}")
-        logger.info(f"━━━ END PRE-CALL ━━━")
+        display_address = r.address_normalized or r.candidate_address
+        logger.info("  ── ENRICHMENT RESULT ──")
+        logger.info("  name:     %s", r.owner_name or '(none)')
+        logger.info("  email:    %s", r.candidate_email or '(none)')
+        logger.info("  address:  %s", display_address or '(none)')
+        logger.info("  geocode:  %s,%s confidence=%s",
+                    r.geocode_lat, r.geocode_lng, r.geocode_confidence or '(none)')
+        logger.info("  dpv:      %s", r.dpv_match_code or '(none)')
+        logger.info("  line:     %s sms=%s", r.line_type or '(none)', r.sms_eligible)
+        logger.info("  source:   %s", r.record_source)
+        logger.info("━━━ END PRE-CALL ━━━")
 
         # Populate global_data for LLM context — tools get call_id from raw_data
         global_data = {
             "caller_phone": caller_phone,
-            "owner_name": owner_name or "Unknown",
-            "candidate_email": candidate_email,
-            "candidate_address": display_address or candidate_address,
-            "line_type": line_type or "unknown",
-            "sms_eligible": sms_eligible,
-            "record_source": record_source,
+            "owner_name": r.owner_name or "Unknown",
+            "candidate_email": r.candidate_email,
+            "candidate_address": display_address,
+            "line_type": r.line_type or "unknown",
+            "sms_eligible": r.sms_eligible,
+            "record_source": r.record_source,
         }
         # Merge rich Trestle data so the LLM can reference it naturally
-        global_data.update(trestle_extras)
+        global_data.update(r.trestle_extras)
         agent.set_global_data(global_data)
 
         # ── Customize greeting step ─────────────────────────────────
+        # Look these up on the per-call agent: the SDK deep-copies the
+        # contexts builder for every request, so a handle cached on self
+        # would point at the shared template and leak edits across calls.
         ctx = agent._contexts_builder.get_context("default")
         greeting = ctx.get_step("greeting")
         greeting.clear_sections()
 
-        if record_source == "returning" and owner_name:
-            greeting.add_section("Task", "Welcome back a returning caller")
-            greeting.add_bullets("Process", [
-                f"You remember {owner_name}. Reference the prior contact naturally.",
-                f"Confirm identity: 'Am I speaking with {owner_name}?'",
-                "Call confirm_identity with the result",
-            ])
-        elif owner_name:
-            greeting.add_section("Task", "Greet a new caller you've already researched")
-            greeting.add_bullets("Process", [
-                f"You pulled the file on this number. You've got {owner_name}.",
-                f"Confirm identity: 'Am I speaking with {owner_name}?'",
-                "Call confirm_identity with the result",
-            ])
+        if r.record_source == "returning" and r.owner_name:
+            task, bullets = self._GREETING_RETURNING
+        elif r.owner_name:
+            task, bullets = self._GREETING_RESEARCHED
         else:
-            greeting.add_section("Task", "Greet an unknown caller")
-            greeting.add_bullets("Process", [
-                "No name on file. Greet generically but in character.",
-                "'Mars Investigations. Veronica Mars speaking. Who am I talking to?'",
-                "Call confirm_identity with their response",
-            ])
+            task, bullets = self._GREETING_UNKNOWN
+        greeting.add_section("Task", task)
+        greeting.add_bullets("Process", [b.format(name=r.owner_name) for b in bullets])
 
         # ── Remove steps that don't apply ────────────────────────────
 
-        # Remove confirm_address if no candidate address on file
-        if not (display_address or candidate_address):
-            try:
-                ctx.remove_step("confirm_address")
-            except Exception:
-                pass
-
         # Phase 1: always remove SMS steps (Phase 3)
-        for step_name in ["sms_consent"]:
-            try:
-                ctx.remove_step(step_name)
-            except Exception:
-                pass
-
+        steps_to_remove = {"sms_consent"}
+        # Remove confirm_address if no candidate address on file
+        if not display_address:
+            steps_to_remove.add("confirm_address")
         # Remove email_confirm if no candidate email
-        if not candidate_email:
-            try:
-                ctx.remove_step("email_confirm")
-            except Exception:
-                pass
+        if not r.candidate_email:
+            steps_to_remove.add("email_confirm")
+        # remove_step is a no-op for names that aren't there
+        for step_name in steps_to_remove:
+            ctx.remove_step(step_name)
 
     # ── Tools ────────────────────────────────────────────────────────
 
@@ -726,6 +855,36 @@ class VeronicaAgent(AgentBase):
             caller_phone = global_data.get("caller_phone", "")
             return call_id, global_data, caller_phone
 
+        def _requires_call(handler):
+            """Reject requests without a call_id before any state I/O.
+
+            Otherwise they'd all share one "unknown" state row.
+            """
+            @wraps(handler)
+            def wrapper(args, raw_data):
+                if not (raw_data or {}).get("call_id"):
+                    logger.warning("%s: request without call_id, ignoring", handler.__name__)
+                    return SwaigFunctionResult("Session error.")
+                return handler(args, raw_data)
+            return wrapper
+
+        def _bump(state, key):
+            """Increment a retry counter in call state and return the new count."""
+            count = state[key] = state.get(key, 0) + 1
+            return count
+
+        def _record_postmark_result(call_id, future):
+            pm = future.result()
+            if pm["success"]:
+                # Runs on the batcher thread and may land after on_summary
+                # has deleted the state; don't recreate it for a finished call
+                if call_state_exists(call_id):
+                    with call_state_session(call_id) as state:
+                        state["postmark_message_id"] = pm["message_id"]
+                logger.info("process_email_consent: Postmark sent, MessageID=%s", pm['message_id'])
+            else:
+                logger.error("process_email_consent: Postmark failed: %s", pm['error'])
+
         # ── confirm_identity ─────────────────────────────────────────
 
         @self.tool(
@@ -749,41 +908,39 @@ class VeronicaAgent(AgentBase):
                 "required": ["confirmed"],
             },
         )
+        @_requires_call
         def confirm_identity(args, raw_data):
             confirmed = args.get("confirmed", False)
             caller_name = args.get("caller_name")
             call_id, global_data, caller_phone = _get_call_context(raw_data)
 
-            state = load_call_state(call_id)
-            state["identity_confirmed"] = confirmed
-            if not confirmed:
-                state["identity_mismatch"] = True
-                if caller_name:
-                    state["owner_name"] = caller_name
-
-            save_call_state(call_id, state)
+            with call_state_session(call_id) as state:
+                state["identity_confirmed"] = confirmed
+                if not confirmed:
+                    state["identity_mismatch"] = True
+                    if caller_name:
+                        state["owner_name"] = caller_name
 
-            # Update global_data if name changed
-            updates = {}
-            if caller_name and not confirmed:
-                updates["owner_name"] = caller_name
+                # Update global_data if name changed
+                updates = {}
+                if caller_name and not confirmed:
+                    updates["owner_name"] = caller_name
 
-            result = SwaigFunctionResult("Identity noted." if confirmed else "Noted — different person.")
+                result = SwaigFunctionResult("Identity noted." if confirmed else "Noted — different person.")
 
-            if updates:
-                gd = dict(global_data)
-                gd.update(updates)
-                result.update_global_data(gd)
+                if updates:
+                    result.update_global_data(updates)
 
-            # Route: if candidate email exists → email_confirm, else → email_collection
-            candidate_email = global_data.get("candidate_email")
-            if candidate_email:
-                result.swml_change_step("email_confirm")
-            else:
-                result.swml_change_step("email_collection")
+                # Route: if candidate email exists → email_confirm, else → email_collection
+                candidate_email = global_data.get("candidate_email")
+                if candidate_email:
+                    result.swml_change_step("email_confirm")
+                else:
+                    result.swml_change_step("email_collection")
 
-            logger.info(f"confirm_identity: confirmed={confirmed}, next={'email_confirm' if candidate_email else 'email_collection'}")
-            return result
+                logger.info("confirm_identity: confirmed=%s, next=%s",
+                            confirmed, 'email_confirm' if candidate_email else 'email_collection')
+                return result
 
         # ── process_email_confirmation ────────────────────────────────
 
@@ -803,38 +960,33 @@ class VeronicaAgent(AgentBase):
                 "required": ["confirmed"],
             },
         )
+        @_requires_call
         def process_email_confirmation(args, raw_data):
             confirmed = args.get("confirmed", False)
             call_id, global_data, caller_phone = _get_call_context(raw_data)
 
-            state = load_call_state(call_id)
-
-            if confirmed:
-                # Use candidate email as working email
-                state["working_email"] = global_data.get("candidate_email")
-                state["email_source"] = "trestle_confirmed"
-                save_call_state(call_id, state)
+            with call_state_session(call_id) as state:
+                if confirmed:
+                    # Use candidate email as working email
+                    state["working_email"] = global_data.get("candidate_email")
+                    state["email_source"] = "trestle_confirmed"
 
-                result = SwaigFunctionResult("Email confirmed.")
-                result.update_global_data({
-                    **global_data,
-                    "working_email": state["working_email"],
-                })
-                result.swml_change_step("zerobounce_check")
-                logger.info(f"email_confirm: accepted candidate → zerobounce_check")
-            else:
-                # Clear stale candidate so LLM stops referencing it
-                save_call_state(call_id, state)
-                result = SwaigFunctionResult("No problem — let's get the right one.")
-                result.update_global_data({
-                    **global_data,
-                    "candidate_email": None,
-                    "working_email": None,
-                })
-                result.swml_change_step("email_collection")
-                logger.info(f"email_confirm: rejected candidate '{global_data.get('candidate_email')}' → email_collection")
+                    result = SwaigFunctionResult("Email confirmed.")
+                    result.update_global_data({"working_email": state["working_email"]})
+                    result.swml_change_step("zerobounce_check")
+                    logger.info("email_confirm: accepted candidate → zerobounce_check")
+                else:
+                    # Clear stale candidate so LLM stops referencing it
+                    result = SwaigFunctionResult("No problem — let's get the right one.")
+                    result.update_global_data({
+                        "candidate_email": None,
+                        "working_email": None,
+                    })
+                    result.swml_change_step("email_collection")
+                    logger.info("email_confirm: rejected candidate '%s' → email_collection",
+                                global_data.get('candidate_email'))
 
-            return result
+                return result
 
         # ── initiate_email_collection (bridge) ───────────────────────
 
@@ -852,7 +1004,8 @@ class VeronicaAgent(AgentBase):
             # When Phase 3 is built: if sms_eligible → sms_consent, else → voice_spelling
             result = SwaigFunctionResult("Collecting email by voice.")
             result.swml_change_step("voice_spelling")
-            logger.info(f"initiate_email_collection: sms_eligible={sms_eligible}, routing to voice_spelling (Phase 1)")
+            logger.info("initiate_email_collection: sms_eligible=%s, routing to voice_spelling (Phase 1)",
+                        sms_eligible)
             return result
 
         # ── submit_spelled_email ─────────────────────────────────────
@@ -883,63 +1036,61 @@ class VeronicaAgent(AgentBase):
                 "required": ["email"],
             },
         )
+        @_requires_call
         def submit_spelled_email(args, raw_data):
             raw_email = args.get("email", "").strip()
             confirmed = args.get("confirmed", False)
             call_id, global_data, caller_phone = _get_call_context(raw_data)
 
-            state = load_call_state(call_id)
-
-            # Normalize the spoken email
-            email = normalize_spoken_email(raw_email)
-
-            # Basic format check
-            if not re.match(r"^[^@\s]+@[^@\s]+\.[^@\s]+$", email):
-                state["spelling_attempts"] = state.get("spelling_attempts", 0) + 1
-                save_call_state(call_id, state)
+            with call_state_session(call_id) as state:
+                # Normalize the spoken email
+                email = normalize_spoken_email(raw_email)
+
+                # Basic format check
+                if not _EMAIL_RE.match(email):
+                    attempts = _bump(state, "spelling_attempts")
+
+                    if attempts >= 3:
+                        state["follow_up_required"] = True
+                        state["follow_up_reason"] = "email_not_captured"
+                        result = SwaigFunctionResult(
+                            "Email couldn't be captured after multiple attempts. "
+                            "Follow-up will be scheduled."
+                        )
+                        result.swml_change_step("wrap_up")
+                        logger.info("submit_spelled_email: 3rd failure → wrap_up")
+                        return result
+
+                    # NATO readback only once the address has an "@" —
+                    # before that the raw letters are all we can offer
+                    heard = nato_spell_email(email) if "@" in email else email
+                    result = SwaigFunctionResult(
+                        f"That doesn't look like a valid email. I got: {heard}. "
+                        "Ask them to try spelling it again."
+                    )
+                    result.swml_change_step("voice_spelling")
+                    return result
 
-                if state["spelling_attempts"] >= 3:
-                    state["follow_up_required"] = True
-                    state["follow_up_reason"] = "email_not_captured"
-                    save_call_state(call_id, state)
+                if not confirmed:
+                    # Read back in NATO and ask for confirmation
+                    nato = nato_spell_email(email)
                     result = SwaigFunctionResult(
-                        "Email couldn't be captured after multiple attempts. "
-                        "Follow-up will be scheduled."
+                        f"Read back to the caller: '{nato}'. "
+                        "Ask if that's correct. Then call submit_spelled_email again with confirmed=true."
                     )
-                    result.swml_change_step("wrap_up")
-                    logger.info("submit_spelled_email: 3rd failure → wrap_up")
                     return result
 
-                # Generate NATO readback for the attempt
-                nato = nato_spell_email(email) if "@" in email else email
-                result = SwaigFunctionResult(
-                    f"That doesn't look like a valid email. I got: {nato}. "
-                    "Ask them to try spelling it again."
-                )
-                result.swml_change_step("voice_spelling")
-                return result
+                # Confirmed — store and validate
+                state["working_email"] = email
+                state["email_source"] = "voice_spelling"
+                _bump(state, "spelling_attempts")
 
-            if not confirmed:
-                # Read back in NATO and ask for confirmation
-                nato = nato_spell_email(email)
-                result = SwaigFunctionResult(
-                    f"Read back to the caller: '{nato}'. "
-                    "Ask if that's correct. Then call submit_spelled_email again with confirmed=true."
-                )
+                result = SwaigFunctionResult("Got it.")
+                result.update_global_data({"working_email": email})
+                result.swml_change_step("zerobounce_check")
+                logger.info("submit_spelled_email: confirmed '%s' → zerobounce_check", email)
                 return result
 
-            # Confirmed — store and validate
-            state["working_email"] = email
-            state["email_source"] = "voice_spelling"
-            state["spelling_attempts"] = state.get("spelling_attempts", 0) + 1
-            save_call_state(call_id, state)
-
-            result = SwaigFunctionResult("Got it.")
-            result.update_global_data({**global_data, "working_email": email})
-            result.swml_change_step("zerobounce_check")
-            logger.info(f"submit_spelled_email: confirmed '{email}' → zerobounce_check")
-            return result
-
         # ── validate_email (bridge — calls ZeroBounce) ───────────────
 
         @self.tool(
@@ -949,92 +1100,93 @@ class VeronicaAgent(AgentBase):
             fillers={"en-US": ["Let me check that real quick", "Running that through my system", "Verifying that one"]},
             parameters={"type": "object", "properties": {}},
         )
+        @_requires_call
         def validate_email(args, raw_data):
             call_id, global_data, caller_phone = _get_call_context(raw_data)
 
-            state = load_call_state(call_id)
-            email = state.get("working_email") or global_data.get("working_email")
+            # The tool that set working_email put it in global_data too, so
+            # start ZeroBounce on that while the state loads
+            hinted = global_data.get("working_email")
+            zb_future = submit_zerobounce_validate(hinted) if hinted else None
 
-            if not email:
-                result = SwaigFunctionResult("No email to validate.")
-                result.swml_change_step("email_collection")
-                return result
+            with call_state_session(call_id) as state:
+                email = state.get("working_email") or hinted
 
-            # Call ZeroBounce
-            zb = zerobounce_validate(email)
-
-            if zb is None:
-                # API failed — proceed with unknown status
-                state["zb_status"] = "api_error"
-                save_call_state(call_id, state)
-                result = SwaigFunctionResult("Email check passed.")
-                result.update_global_data({
-                    **global_data,
-                    "candidate_email": email,
-                    "working_email": email,
-                })
-                result.swml_change_step("email_send_consent")
-                logger.info(f"validate_email: API error for '{email}', proceeding → email_send_consent")
-                return result
+                if not email:
+                    result = SwaigFunctionResult("No email to validate.")
+                    result.swml_change_step("email_collection")
+                    return result
 
-            state["zb_status"] = zb["status"]
-            state["zb_sub_status"] = zb["sub_status"]
-            save_call_state(call_id, state)
-
-            if zb["is_valid"]:
-                # Valid — update global_data so LLM knows the confirmed email
-                result = SwaigFunctionResult("Email checks out.")
-                result.update_global_data({
-                    **global_data,
-                    "candidate_email": email,
-                    "working_email": email,
-                })
-                result.swml_change_step("email_send_consent")
-                logger.info(f"validate_email: '{email}' valid → email_send_consent")
-                return result
+                # Call ZeroBounce — reuse the early lookup when it was for
+                # this address. The hint comes from the same tool write as
+                # the state, so a mismatch is rare; by then the early lookup
+                # has usually started and is billed anyway.
+                if email == hinted:
+                    zb = zb_future.result()
+                else:
+                    if zb_future:
+                        logger.info("validate_email: hint '%s' != state '%s', early lookup %s",
+                                    hinted, email,
+                                    "cancelled" if zb_future.cancel() else "already sent")
+                    zb = zerobounce_validate(email)
+
+                if zb is None:
+                    # API failed — proceed with unknown status
+                    state["zb_status"] = "api_error"
+                    proceed, reason = True, "API error"
+                else:
+                    state["zb_status"] = zb["status"]
+                    state["zb_sub_status"] = zb["sub_status"]
+                    if zb["is_valid"]:
+                        proceed, reason = True, "valid"
+                    elif not zb["is_invalid"]:
+                        # Unknown/catch-all — proceed but flag for post-call re-check
+                        state["follow_up_required"] = True
+                        state["follow_up_reason"] = "email_validation_failed"
+                        proceed, reason = True, "unknown status"
+                    else:
+                        proceed = False
 
-            if not zb["is_invalid"]:
-                # Unknown/catch-all — proceed but flag for post-call re-check
-                state["follow_up_required"] = True
-                state["follow_up_reason"] = "email_validation_failed"
-                save_call_state(call_id, state)
-                result = SwaigFunctionResult("Email checks out.")
-                result.update_global_data({
-                    **global_data,
-                    "candidate_email": email,
-                    "working_email": email,
-                })
-                result.swml_change_step("email_send_consent")
-                logger.info(f"validate_email: '{email}' unknown status, proceeding → email_send_consent")
-                return result
+                if proceed:
+                    # Update global_data so LLM knows the confirmed email
+                    result = SwaigFunctionResult(
+                        "Email check passed." if zb is None else "Email checks out."
+                    )
+                    result.update_global_data({
+                        "candidate_email": email,
+                        "working_email": email,
+                    })
+                    result.swml_change_step("email_send_consent")
+                    logger.info("validate_email: '%s' %s, proceeding → email_send_consent",
+                                email, reason)
+                    return result
 
-            # Invalid — retry or give up
-            state["email_attempts"] = state.get("email_attempts", 0) + 1
-            save_call_state(call_id, state)
+                # Invalid — retry or give up
+                attempts = _bump(state, "email_attempts")
 
-            if state["email_attempts"] >= 2:
-                state["follow_up_required"] = True
-                state["follow_up_reason"] = "email_validation_failed"
-                save_call_state(call_id, state)
+                if attempts >= 2:
+                    state["follow_up_required"] = True
+                    state["follow_up_reason"] = "email_validation_failed"
+                    result = SwaigFunctionResult(
+                        "Email validation failed after retries. Follow-up will be scheduled. "
+                        "Tell the caller: 'We're not going to crack this one tonight. "
+                        "I'll reach back out — we'll get it sorted.'"
+                    )
+                    result.swml_change_step("wrap_up")
+                    logger.info("validate_email: invalid, retries exhausted → wrap_up")
+                    return result
+
+                # Can retry — back to collection
                 result = SwaigFunctionResult(
-                    "Email validation failed after retries. Follow-up will be scheduled. "
-                    "Tell the caller: 'We're not going to crack this one tonight. "
-                    "I'll reach back out — we'll get it sorted.'"
+                    "That email didn't check out. Tell the caller: "
+                    "'That one's not checking out on my end. Happens. You got another one I can try?'"
                 )
-                result.swml_change_step("wrap_up")
-                logger.info(f"validate_email: invalid, retries exhausted → wrap_up")
+                result.update_global_data({"working_email": None})
+                result.swml_change_step("email_collection")
+                logger.info("validate_email: invalid, attempt %s → email_collection",
+                            attempts)
                 return result
 
-            # Can retry — back to collection
-            result = SwaigFunctionResult(
-                "That email didn't check out. Tell the caller: "
-                "'That one's not checking out on my end. Happens. You got another one I can try?'"
-            )
-            result.update_global_data({**global_data, "working_email": None})
-            result.swml_change_step("email_collection")
-            logger.info(f"validate_email: invalid, attempt {state['email_attempts']} → email_collection")
-            return result
-
         # ── process_email_consent ────────────────────────────────────
 
         @self.tool(
@@ -1053,83 +1205,79 @@ class VeronicaAgent(AgentBase):
                 "required": ["consented"],
             },
         )
+        @_requires_call
         def process_email_consent(args, raw_data):
             consented = args.get("consented", False)
             call_id, global_data, caller_phone = _get_call_context(raw_data)
+            sending = None
+
+            with call_state_session(call_id) as state:
+                if logger.isEnabledFor(logging.INFO):
+                    entry = {
+                        "call_id": call_id,
+                        "caller_phone": caller_phone,
+                        "state_email": state.get("working_email"),
+                        "gd_email": global_data.get("working_email"),
+                    }
+                    logger.info("process_email_consent: call_id=%(call_id)s caller_phone=%(caller_phone)s "
+                                "state.working_email=%(state_email)s global_data.working_email=%(gd_email)s",
+                                entry, extra=entry)
 
-            state = load_call_state(call_id)
-            logger.info(f"process_email_consent: call_id={call_id} caller_phone={caller_phone}")
-            logger.info(f"process_email_consent: state.working_email={state.get('working_email')}")
-            logger.info(f"process_email_consent: global_data.working_email={global_data.get('working_email')}")
-
-            state["email_consent"] = consented
-            save_call_state(call_id, state)
-
-            # Audit trail
-            log_consent(caller_phone, call_id, "email_send", consented)
+                state["email_consent"] = consented
 
-            if consented:
-                # Get email: state → global_data.working_email → global_data.candidate_email
-                email = (
-                    state.get("working_email")
-                    or global_data.get("working_email")
-                    or global_data.get("candidate_email")
-                )
-                logger.info(f"process_email_consent: resolved email={email}")
+                # Audit trail
+                log_consent(caller_phone, call_id, "email_send", consented)
 
-                if email and caller_phone:
-                    upsert_caller(caller_phone,
-                        validated_email=email,
-                        last_call_at=datetime.now(timezone.utc).isoformat(),
+                if consented:
+                    # Get email: state → global_data.working_email → global_data.candidate_email
+                    email = (
+                        state.get("working_email")
+                        or global_data.get("working_email")
+                        or global_data.get("candidate_email")
                     )
-
-                # Send the confirmation email via Postmark
-                owner_name = global_data.get("owner_name", "there")
-                if email:
-                    logger.info(f"process_email_consent: sending Postmark to {email}")
-                    pm = postmark_send(
-                        to_email=email,
-                        subject="Mars Investigations — Confirmation",
-                        html_body=(
-                            f"<p>Hey {owner_name},</p>"
-                            f"<p>This is Veronica Mars confirming we've got your email on file.</p>"
-                            f"<p>If you didn't just speak with a sharp-tongued PI from Neptune, "
-                            f"someone's got some explaining to do.</p>"
-                            f"<p>— V</p>"
-                            f"<p><em>Mars Investigations</em></p>"
-                        ),
-                        text_body=(
-                            f"Hey {owner_name},\n\n"
-                            f"This is Veronica Mars confirming we've got your email on file.\n\n"
-                            f"If you didn't just speak with a sharp-tongued PI from Neptune, "
-                            f"someone's got some explaining to do.\n\n"
-                            f"— V\n"
-                            f"Mars Investigations"
-                        ),
-                    )
-                    if pm and pm["success"]:
-                        state["postmark_message_id"] = pm["message_id"]
-                        save_call_state(call_id, state)
-                        logger.info(f"process_email_consent: Postmark sent, MessageID={pm['message_id']}")
-                    elif pm:
-                        logger.error(f"process_email_consent: Postmark failed: {pm['error']}")
+                    logger.info("process_email_consent: resolved email=%s", email)
+
+                    if email and caller_phone:
+                        upsert_caller(caller_phone, returning=False,
+                            validated_email=email,
+                            last_call_at=utc_now_iso(),
+                        )
+
+                    # Send the confirmation email via Postmark
+                    owner_name = global_data.get("owner_name", "there")
+                    if email:
+                        logger.info("process_email_consent: sending Postmark to %s", email)
+                        sending = postmark_submit(
+                            to_email=email,
+                            subject=_CONFIRMATION_SUBJECT,
+                            html_body=_CONFIRMATION_HTML.format(owner_name=owner_name),
+                            text_body=_CONFIRMATION_TEXT.format(owner_name=owner_name),
+                        )
+                        if not sending:
+                            logger.warning("process_email_consent: Postmark not configured, skipping send")
                     else:
-                        logger.warning("process_email_consent: Postmark not configured, skipping send")
-                else:
-                    logger.error(f"process_email_consent: no email to send to! state keys={list(state.keys())}")
+                        logger.error("process_email_consent: no email to send to! state keys=%s",
+                                     list(state.keys()))
 
-                result = SwaigFunctionResult("Consent recorded. Confirmation email sent.")
-            else:
-                result = SwaigFunctionResult("Understood — no email will be sent.")
+                    result = SwaigFunctionResult("Consent recorded. Confirmation email is being sent.")
+                else:
+                    result = SwaigFunctionResult("Understood — no email will be sent.")
 
-            # Route to address flow
-            candidate_addr = global_data.get("candidate_address")
-            if candidate_addr:
-                result.swml_change_step("confirm_address")
-                logger.info(f"process_email_consent: consented={consented} → confirm_address")
-            else:
-                result.swml_change_step("address_collection")
-                logger.info(f"process_email_consent: consented={consented} → address_collection")
+                # Route to address flow
+                candidate_addr = global_data.get("candidate_address")
+                if candidate_addr:
+                    result.swml_change_step("confirm_address")
+                    logger.info("process_email_consent: consented=%s → confirm_address", consented)
+                else:
+                    result.swml_change_step("address_collection")
+                    logger.info("process_email_consent: consented=%s → address_collection",
+                                consented)
+
+            if sending:
+                # Don't hold the caller on the send — record the id when it
+                # lands. Attached after the session saves, so a send that's
+                # already done still finds this call's state.
+                sending.add_done_callback(lambda f: _record_postmark_result(call_id, f))
             return result
 
         # ── Phase 3 placeholder: process_sms_consent ─────────────────
@@ -1150,25 +1298,25 @@ class VeronicaAgent(AgentBase):
                 "required": ["consented"],
             },
         )
+        @_requires_call
         def process_sms_consent(args, raw_data):
             consented = args.get("consented", False)
             call_id, global_data, caller_phone = _get_call_context(raw_data)
 
-            state = load_call_state(call_id)
-            state["sms_consent"] = consented
-            save_call_state(call_id, state)
+            with call_state_session(call_id) as state:
+                state["sms_consent"] = consented
 
-            log_consent(caller_phone, call_id, "sms", consented)
+                log_consent(caller_phone, call_id, "sms", consented)
 
-            if consented:
-                # Phase 3: send SMS with tokenized link, transition to sms_wait
-                result = SwaigFunctionResult("SMS consent recorded. (Phase 3: would send SMS link)")
-                result.swml_change_step("voice_spelling")  # Fallback until Phase 3
-            else:
-                result = SwaigFunctionResult("No problem — let's do it the old-fashioned way.")
-                result.swml_change_step("voice_spelling")
+                if consented:
+                    # Phase 3: send SMS with tokenized link, transition to sms_wait
+                    result = SwaigFunctionResult("SMS consent recorded. (Phase 3: would send SMS link)")
+                    result.swml_change_step("voice_spelling")  # Fallback until Phase 3
+                else:
+                    result = SwaigFunctionResult("No problem — let's do it the old-fashioned way.")
+                    result.swml_change_step("voice_spelling")
 
-            return result
+                return result
 
         # ── Address tools ─────────────────────────────────────────────
 
@@ -1189,36 +1337,35 @@ class VeronicaAgent(AgentBase):
                 "required": ["response"],
             },
         )
+        @_requires_call
         def process_address_confirmation(args, raw_data):
             response = args.get("response", "declined")
             call_id, global_data, caller_phone = _get_call_context(raw_data)
-            state = load_call_state(call_id)
-
-            logger.info(f"process_address_confirmation: response={response}")
-
-            if response == "confirmed":
-                # Use the pre-enriched address from global_data
-                address = global_data.get("candidate_address", "")
-                state["collected_address"] = address
-                state["address_source"] = "confirmed_on_file"
-                save_call_state(call_id, state)
-
-                result = SwaigFunctionResult("Address confirmed. Let me verify it.")
-                result.swml_change_step("address_validation")
-                logger.info(f"process_address_confirmation: confirmed → address_validation")
-                return result
+            with call_state_session(call_id) as state:
+                logger.info("process_address_confirmation: response=%s", response)
+
+                if response == "confirmed":
+                    # Use the pre-enriched address from global_data
+                    address = global_data.get("candidate_address", "")
+                    state["collected_address"] = address
+                    state["address_source"] = "confirmed_on_file"
+
+                    result = SwaigFunctionResult("Address confirmed. Let me verify it.")
+                    result.swml_change_step("address_validation")
+                    logger.info("process_address_confirmation: confirmed → address_validation")
+                    return result
 
-            elif response == "denied":
-                result = SwaigFunctionResult("No problem. Let's get the right one.")
-                result.swml_change_step("address_collection")
-                logger.info(f"process_address_confirmation: denied → address_collection")
-                return result
+                elif response == "denied":
+                    result = SwaigFunctionResult("No problem. Let's get the right one.")
+                    result.swml_change_step("address_collection")
+                    logger.info("process_address_confirmation: denied → address_collection")
+                    return result
 
-            else:  # declined
-                result = SwaigFunctionResult("That's fine, we can skip that for now.")
-                result.swml_change_step("wrap_up")
-                logger.info(f"process_address_confirmation: declined → wrap_up")
-                return result
+                else:  # declined
+                    result = SwaigFunctionResult("That's fine, we can skip that for now.")
+                    result.swml_change_step("wrap_up")
+                    logger.info("process_address_confirmation: declined → wrap_up")
+                    return result
 
         @self.tool(
             name="submit_address",
@@ -1246,52 +1393,50 @@ class VeronicaAgent(AgentBase):
                 "required": ["address"],
             },
         )
+        @_requires_call
         def submit_address(args, raw_data):
             raw_address = args.get("address", "").strip()
             confirmed = args.get("confirmed", False)
             call_id, global_data, caller_phone = _get_call_context(raw_data)
-            state = load_call_state(call_id)
-
-            if not raw_address:
-                result = SwaigFunctionResult("I didn't catch an address. Ask them again.")
-                result.swml_change_step("address_collection")
-                return result
-
-            # Geocode to normalize the address
-            geo = geocode_address(raw_address)
-            if geo:
-                normalized = geo["formatted_address"]
-            else:
-                normalized = raw_address  # Fall back to raw if geocode fails
+            with call_state_session(call_id) as state:
+                if not raw_address:
+                    result = SwaigFunctionResult("I didn't catch an address. Ask them again.")
+                    result.swml_change_step("address_collection")
+                    return result
 
-            if not confirmed:
-                # Cache the geocode result in state for when they confirm
-                state["pending_address"] = normalized
-                state["pending_address_raw"] = raw_address
+                # Geocode to normalize the address
+                geo = geocode_address(raw_address)
                 if geo:
-                    state["pending_geocode"] = {
-                        "lat": geo["lat"], "lng": geo["lng"],
-                        "confidence": geo["confidence"],
-                    }
-                save_call_state(call_id, state)
+                    normalized = geo["formatted_address"]
+                else:
+                    normalized = raw_address  # Fall back to raw if geocode fails
+
+                if not confirmed:
+                    # Cache the geocode result in state for when they confirm
+                    state["pending_address"] = normalized
+                    state["pending_address_raw"] = raw_address
+                    if geo:
+                        state["pending_geocode"] = {
+                            "lat": geo["lat"], "lng": geo["lng"],
+                            "confidence": geo["confidence"],
+                        }
 
-                result = SwaigFunctionResult(
-                    f"Read this back to the caller: '{normalized}'. "
-                    "Ask if that's correct. Then call submit_address again with confirmed=true."
-                )
-                return result
+                    result = SwaigFunctionResult(
+                        f"Read this back to the caller: '{normalized}'. "
+                        "Ask if that's correct. Then call submit_address again with confirmed=true."
+                    )
+                    return result
 
-            # Confirmed — store and route to validation
-            state["collected_address"] = normalized
-            state["address_source"] = "voice_collected"
-            state["address_attempts"] = state.get("address_attempts", 0) + 1
-            save_call_state(call_id, state)
+                # Confirmed — store and route to validation
+                state["collected_address"] = normalized
+                state["address_source"] = "voice_collected"
+                _bump(state, "address_attempts")
 
-            result = SwaigFunctionResult("Got it.")
-            result.update_global_data({**global_data, "collected_address": normalized})
-            result.swml_change_step("address_validation")
-            logger.info(f"submit_address: confirmed '{normalized}' → address_validation")
-            return result
+                result = SwaigFunctionResult("Got it.")
+                result.update_global_data({"collected_address": normalized})
+                result.swml_change_step("address_validation")
+                logger.info("submit_address: confirmed '%s' → address_validation", normalized)
+                return result
 
         @self.tool(
             name="validate_address",
@@ -1300,93 +1445,90 @@ class VeronicaAgent(AgentBase):
             fillers={"en-US": ["Checking that address", "Running it through the system"]},
             parameters={"type": "object", "properties": {}},
         )
+        @_requires_call
         def validate_address(args, raw_data):
             call_id, global_data, caller_phone = _get_call_context(raw_data)
-            state = load_call_state(call_id)
+            with call_state_session(call_id) as state:
+                address = state.get("collected_address") or global_data.get("collected_address") or global_data.get("candidate_address")
 
-            address = state.get("collected_address") or global_data.get("collected_address") or global_data.get("candidate_address")
+                if not address:
+                    result = SwaigFunctionResult("No address to validate.")
+                    result.swml_change_step("address_collection")
+                    return result
 
-            if not address:
-                result = SwaigFunctionResult("No address to validate.")
-                result.swml_change_step("address_collection")
-                return result
+                # Run full enrichment pipeline (geocode + Smarty)
+                normalized, lat, lng, confidence, dpv = self._enrich_address(address)
+
+                if normalized is None:
+                    # Geocode failed — accept the raw address and proceed
+                    state["address_validation_status"] = "geocode_error"
 
-            # Run full enrichment pipeline (geocode + Smarty)
-            normalized, lat, lng, confidence, dpv = self._enrich_address(address)
+                    if caller_phone:
+                        upsert_caller(caller_phone, returning=False,
+                            candidate_address=address,
+                            last_call_at=utc_now_iso(),
+                        )
 
-            if normalized is None:
-                # Geocode failed — accept the raw address and proceed
-                state["address_validation_status"] = "geocode_error"
-                save_call_state(call_id, state)
+                    result = SwaigFunctionResult("Address noted.")
+                    result.update_global_data({"candidate_address": address})
+                    result.swml_change_step("wrap_up")
+                    logger.info("validate_address: geocode failed for '%s', accepting → wrap_up",
+                                address)
+                    return result
 
+                # Store enrichment results
                 if caller_phone:
-                    upsert_caller(caller_phone,
+                    upsert_caller(caller_phone, returning=False,
                         candidate_address=address,
-                        last_call_at=datetime.now(timezone.utc).isoformat(),
+                        address_normalized=normalized,
+                        geocode_lat=lat,
+                        geocode_lng=lng,
+                        geocode_confidence=confidence,
+                        dpv_match_code=dpv,
+                        last_call_at=utc_now_iso(),
                     )
 
-                result = SwaigFunctionResult("Address noted.")
-                result.update_global_data({**global_data, "candidate_address": address})
-                result.swml_change_step("wrap_up")
-                logger.info(f"validate_address: geocode failed for '{address}', accepting → wrap_up")
-                return result
+                # DPV check: Y = deliverable, S = secondary missing, D = drop
+                if dpv in ("Y", "S", "D", None):
+                    # Valid or acceptable — proceed
+                    state["address_validation_status"] = "valid"
 
-            # Store enrichment results
-            if caller_phone:
-                upsert_caller(caller_phone,
-                    candidate_address=address,
-                    address_normalized=normalized,
-                    geocode_lat=lat,
-                    geocode_lng=lng,
-                    geocode_confidence=confidence,
-                    dpv_match_code=dpv,
-                    last_call_at=datetime.now(timezone.utc).isoformat(),
-                )
+                    result = SwaigFunctionResult("Address checks out.")
+                    result.update_global_data({
+                        "candidate_address": normalized,
+                        "collected_address": normalized,
+                    })
+                    result.swml_change_step("wrap_up")
+                    logger.info("validate_address: '%s' dpv=%s → wrap_up", normalized, dpv)
+                    return result
 
-            # DPV check: Y = deliverable, S = secondary missing, D = drop
-            if dpv in ("Y", "S", "D", None):
-                # Valid or acceptable — proceed
-                state["address_validation_status"] = "valid"
-                save_call_state(call_id, state)
-
-                result = SwaigFunctionResult("Address checks out.")
-                result.update_global_data({
-                    **global_data,
-                    "candidate_address": normalized,
-                    "collected_address": normalized,
-                })
-                result.swml_change_step("wrap_up")
-                logger.info(f"validate_address: '{normalized}' dpv={dpv} → wrap_up")
-                return result
+                # DPV N or vacant — address didn't validate
+                attempts = _bump(state, "address_attempts")
 
-            # DPV N or vacant — address didn't validate
-            state["address_attempts"] = state.get("address_attempts", 0) + 1
-            save_call_state(call_id, state)
+                if attempts >= 2:
+                    state["follow_up_required"] = True
+                    state["follow_up_reason"] = "address_validation_failed"
 
-            if state["address_attempts"] >= 2:
-                state["follow_up_required"] = True
-                state["follow_up_reason"] = "address_validation_failed"
-                save_call_state(call_id, state)
+                    result = SwaigFunctionResult(
+                        "Address couldn't be verified. Follow-up will be scheduled. "
+                        "Tell the caller: 'I couldn't verify that one. "
+                        "Don't worry — I'll follow up to get it sorted.'"
+                    )
+                    result.swml_change_step("wrap_up")
+                    logger.info("validate_address: dpv=%s, retries exhausted → wrap_up", dpv)
+                    return result
 
+                # Retry — back to collection
                 result = SwaigFunctionResult(
-                    "Address couldn't be verified. Follow-up will be scheduled. "
-                    "Tell the caller: 'I couldn't verify that one. "
-                    "Don't worry — I'll follow up to get it sorted.'"
+                    "That address didn't check out. Tell the caller: "
+                    "'That one's not coming up in my system. Can you double-check it for me?'"
                 )
-                result.swml_change_step("wrap_up")
-                logger.info(f"validate_address: dpv={dpv}, retries exhausted → wrap_up")
+                result.update_global_data({"collected_address": None})
+                result.swml_change_step("address_collection")
+                logger.info("validate_address: dpv=%s, attempt %s → address_collection",
+                            dpv, attempts)
                 return result
 
-            # Retry — back to collection
-            result = SwaigFunctionResult(
-                "That address didn't check out. Tell the caller: "
-                "'That one's not coming up in my system. Can you double-check it for me?'"
-            )
-            result.update_global_data({**global_data, "collected_address": None})
-            result.swml_change_step("address_collection")
-            logger.info(f"validate_address: dpv={dpv}, attempt {state['address_attempts']} → address_collection")
-            return result
-
         # ── schedule_followup ────────────────────────────────────────
 
         @self.tool(
@@ -1413,28 +1555,31 @@ class VeronicaAgent(AgentBase):
                 "required": ["reason"],
             },
         )
+        @_requires_call
         def schedule_followup(args, raw_data):
             reason = args.get("reason", "unspecified")
             call_id, global_data, caller_phone = _get_call_context(raw_data)
 
-            state = load_call_state(call_id)
-            state["follow_up_required"] = True
-            state["follow_up_reason"] = reason
-            save_call_state(call_id, state)
+            with call_state_session(call_id) as state:
+                state["follow_up_required"] = True
+                state["follow_up_reason"] = reason
 
-            result = SwaigFunctionResult(f"Follow-up scheduled: {reason}")
-            result.swml_change_step("wrap_up")
-            logger.info(f"schedule_followup: reason={reason} → wrap_up")
-            return result
+                result = SwaigFunctionResult(f"Follow-up scheduled: {reason}")
+                result.swml_change_step("wrap_up")
+                logger.info("schedule_followup: reason=%s → wrap_up", reason)
+                return result
 
     # ── SWML Debug Output ────────────────────────────────────────────
 
     def _render_swml(self, call_id=None, modifications=None):
-        """Override to dump the generated SWML to stderr for debugging."""
+        """Override to dump the generated SWML to stderr when DEBUG_SWML is set."""
         swml = super()._render_swml(call_id, modifications)
+        if not config.DEBUG_SWML:
+            return swml
         try:
             parsed = json.loads(swml) if isinstance(swml, str) else swml
-            print(json.dumps(parsed, indent=2, default=str), file=sys.stderr)
+            sys.stderr.buffer.write(_pretty_json(parsed) + b"\n")
+            sys.stderr.flush()
         except Exception:
             print(swml, file=sys.stderr)
         return swml
@@ -1447,49 +1592,50 @@ class VeronicaAgent(AgentBase):
         Saves full call data to calls/ and cleans up ephemeral state.
         """
         if summary:
-            logger.info(f"Call summary: {summary}")
+            logger.info("Call summary: %s", summary)
 
         if raw_data:
-            calls_dir = Path(__file__).parent / "calls"
-            calls_dir.mkdir(exist_ok=True)
-            call_id = raw_data.get("call_id", "unknown")
-            out_path = calls_dir / f"{call_id}.json"
-            try:
-                out_path.write_text(json.dumps(raw_data, indent=2, default=str))
-                logger.info(f"Saved call data to {out_path}")
-            except Exception as e:
-                logger.error(f"Failed to save call data: {e}")
-
-            # Clean up ephemeral SQLite state for this call
-            delete_call_state(call_id)
-            cleanup_stale_states(24)
+            # Serializing and writing a long call's payload takes a while;
+            # the summary handler returns without waiting for it
+            _SUMMARY_EXECUTOR.submit(_persist_call, raw_data)
 
 
-# Default call state for initialization (avoids circular import)
-DEFAULT_CALL_STATE_INIT = {
-    "owner_name": None,
-    "line_type": None,
-    "sms_eligible": False,
-    "candidate_email": None,
-    "candidate_address": None,
-    "record_source": "new",
-    "identity_confirmed": False,
-    "identity_mismatch": False,
-    "working_email": None,
-    "email_source": None,
-    "email_attempts": 0,
-    "spelling_attempts": 0,
-    "zb_status": None,
-    "zb_sub_status": None,
-    "email_consent": None,
-    "sms_consent": None,
-    "follow_up_required": False,
-    "follow_up_reason": None,
-    "collected_address": None,
-    "address_source": None,
-    "address_attempts": 0,
-    "address_validation_status": None,
-}
+# Exits wait for queued saves, so a shutdown right after hangup keeps the file
+_SUMMARY_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="summary")
+
+_CALLS_DIR = Path(__file__).parent / "calls"
+_CALLS_DIR.mkdir(exist_ok=True)
+
+
+def _persist_call(raw_data):
+    """Save a finished call's data to calls/ and drop its ephemeral state."""
+    call_id = raw_data.get("call_id", "unknown")
+    out_path = _CALLS_DIR / f"{call_id}.json"
+    try:
+        out_path.write_bytes(_pretty_json(raw_data))
+        logger.info("Saved call data to %s", out_path)
+    except Exception as e:
+        logger.error("Failed to save call data: %s", e)
+
+    # Clean up ephemeral SQLite state for this call
+    try:
+        delete_call_state(call_id)
+    except Exception as e:
+        logger.error("Failed to delete call state for %s: %s", call_id, e)
+
+
+# Abandoned call_state rows (no post-prompt ever arrived) are swept here
+# instead of on every summary, keeping the vacuum off the request path
+_STALE_SWEEP_INTERVAL = 3600
+
+
+def _sweep_stale_states():
+    while True:
+        try:
+            cleanup_stale_states(24)
+        except Exception as e:
+            logger.error("Stale call_state sweep failed: %s", e)
+        time.sleep(_STALE_SWEEP_INTERVAL)
 
 
 def create_server():
@@ -1497,6 +1643,9 @@ def create_server():
     server = AgentServer(host=config.HOST, port=config.PORT)
     server.register(VeronicaAgent(), "/swml")
 
+    threading.Thread(target=_backfill_trestle_extras, name="extras-backfill", daemon=True).start()
+    threading.Thread(target=_sweep_stale_states, name="state-sweeper", daemon=True).start()
+
     # Serve static files from web/ directory
     web_dir = Path(__file__).parent / "web"
     if web_dir.exists():